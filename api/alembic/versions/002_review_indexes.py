@@ -0,0 +1,47 @@
+"""review queue and date/category composite indexes
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-09-01 10:00:00.000000
+
+The dashboard's hot queries filter status IN ('ingested','review') with a
+txn_date range and ORDER BY txn_date DESC, which previously needed a
+bitmap-and of two large single-column indexes. A partial index over just
+the unfinalized rows stays a small fraction of the table, and a
+(txn_date, category) composite serves the report aggregates. The bare
+status index is dropped: status='finalized' matches most rows, so it was
+never selective enough to be used.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add review-queue and date/category indexes; drop the bare status index.
+    """
+    op.create_index(
+        'ix_txn_review',
+        'transactions',
+        ['txn_date'],
+        postgresql_where=sa.text("status IN ('ingested', 'review')"),
+    )
+    op.create_index('ix_txn_date_cat', 'transactions', ['txn_date', 'category'])
+    op.drop_index('ix_transactions_status', table_name='transactions')
+
+
+def downgrade() -> None:
+    """
+    Restore the bare status index; drop the composite indexes.
+    """
+    op.create_index('ix_transactions_status', 'transactions', ['status'])
+    op.drop_index('ix_txn_date_cat', table_name='transactions')
+    op.drop_index('ix_txn_review', table_name='transactions')
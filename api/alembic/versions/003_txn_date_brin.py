@@ -0,0 +1,43 @@
+"""BRIN index for txn_date range scans
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-09-01 10:30:00.000000
+
+transactions is ingested in (roughly) date order, so txn_date correlates
+strongly with physical row placement — exactly the shape BRIN is built
+for. The monthly/weekly report queries are all date-range scans, and a
+BRIN index answers them from min/max summaries per block range at a tiny
+fraction of the BTREE's size. Point lookups by exact date are not a hot
+path (the review queue has its own partial index from 002), so the BTREE
+is dropped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Replace the txn_date BTREE with a BRIN index.
+    """
+    op.execute(
+        "CREATE INDEX ix_transactions_txn_date_brin ON transactions "
+        "USING BRIN (txn_date) WITH (pages_per_range = 32)"
+    )
+    op.drop_index('ix_transactions_txn_date', table_name='transactions')
+
+
+def downgrade() -> None:
+    """
+    Restore the txn_date BTREE; drop the BRIN index.
+    """
+    op.create_index('ix_transactions_txn_date', 'transactions', ['txn_date'])
+    op.drop_index('ix_transactions_txn_date_brin', table_name='transactions')
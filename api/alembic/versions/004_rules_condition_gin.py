@@ -0,0 +1,40 @@
+"""GIN index on rules.condition for JSONB containment
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-09-01 11:00:00.000000
+
+Containment lookups on the condition document (rules for a given MCC,
+account, or condition fragment) previously scanned the whole table. GIN
+with the jsonb_path_ops opclass indexes @> at roughly half the size of
+the default jsonb_ops. The rules table is small enough that a plain
+CREATE INDEX (rather than CONCURRENTLY, which cannot run inside the
+migration transaction) is fine.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add the jsonb_path_ops GIN index on rules.condition.
+    """
+    op.execute(
+        "CREATE INDEX ix_rules_condition_gin ON rules "
+        "USING GIN (condition jsonb_path_ops)"
+    )
+
+
+def downgrade() -> None:
+    """
+    Drop the rules.condition GIN index.
+    """
+    op.drop_index('ix_rules_condition_gin', table_name='rules')
@@ -0,0 +1,44 @@
+"""reports payload GIN and kind/period DESC indexes
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-09-01 11:30:00.000000
+
+The "latest monthly report" dashboard query filters kind = 'monthly'
+ORDER BY period DESC, which ix_reports_period_kind (period leading)
+cannot serve without a sort; a (kind, period DESC) B-Tree answers it
+from the first index entry. The payload GIN index covers containment
+filters on the cached report document. As with 004, the table is small
+enough for plain CREATE INDEX inside the migration transaction.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add the (kind, period DESC) B-Tree and payload GIN indexes.
+    """
+    op.execute(
+        "CREATE INDEX ix_reports_kind_period_desc ON reports (kind, period DESC)"
+    )
+    op.execute(
+        "CREATE INDEX ix_reports_payload_gin ON reports "
+        "USING GIN (payload jsonb_path_ops)"
+    )
+
+
+def downgrade() -> None:
+    """
+    Drop the reports payload and kind/period indexes.
+    """
+    op.drop_index('ix_reports_payload_gin', table_name='reports')
+    op.drop_index('ix_reports_kind_period_desc', table_name='reports')
@@ -0,0 +1,41 @@
+"""store hash_id as raw bytes instead of hex text
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-09-01 12:00:00.000000
+
+hash_id held the SHA-256 digest as 64-char hex TEXT; storing the raw 32
+bytes halves the entry size of the unique index that every ingest upsert
+probes. The application still speaks hex — the HashId TypeDecorator
+converts at the bind/result boundary.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Convert hash_id to bytea, rewriting existing hex values.
+    """
+    op.execute(
+        "ALTER TABLE transactions ALTER COLUMN hash_id TYPE bytea "
+        "USING decode(hash_id, 'hex')"
+    )
+
+
+def downgrade() -> None:
+    """
+    Convert hash_id back to hex text.
+    """
+    op.execute(
+        "ALTER TABLE transactions ALTER COLUMN hash_id TYPE text "
+        "USING encode(hash_id, 'hex')"
+    )
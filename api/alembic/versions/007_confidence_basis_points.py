@@ -0,0 +1,44 @@
+"""store confidence as smallint basis points instead of numeric
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-09-01 12:00:00.000000
+
+confidence was NUMERIC(3,2), which the driver returns as Decimal and the
+categorize path compared against freshly-built Decimal thresholds per
+request. Basis points (0-10000) in a SMALLINT make the review check a
+plain integer compare; the API keeps serving a 0-1 float by dividing at
+the serialization boundary.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Convert confidence to smallint basis points and rename to confidence_bp.
+    """
+    op.execute(
+        "ALTER TABLE transactions ALTER COLUMN confidence TYPE smallint "
+        "USING round(confidence * 10000)::smallint"
+    )
+    op.alter_column("transactions", "confidence", new_column_name="confidence_bp")
+
+
+def downgrade() -> None:
+    """
+    Convert confidence_bp back to NUMERIC(3,2) named confidence.
+    """
+    op.alter_column("transactions", "confidence_bp", new_column_name="confidence")
+    op.execute(
+        "ALTER TABLE transactions ALTER COLUMN confidence TYPE numeric(3,2) "
+        "USING (confidence / 10000.0)::numeric(3,2)"
+    )
@@ -0,0 +1,44 @@
+"""add descending txn_date index for latest-N dashboard queries
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-09-01 12:00:00.000000
+
+The only txn_date indexes were the BRIN (range scans) and the composite
+(txn_date, category); neither serves ORDER BY txn_date DESC LIMIT n —
+BRIN has no ordering and the composite is wider than needed. A plain
+descending B-Tree turns the dashboard's latest-N query into a bounded
+index scan.
+
+The review queue needs no new index: ix_txn_review (migration 002) is
+already partial over status IN ('ingested', 'review') and the planner
+proves status = 'review' implies that predicate.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Create the descending txn_date index.
+
+    Plain CREATE INDEX rather than CONCURRENTLY: CONCURRENTLY cannot run
+    inside the migration transaction, and this table is small enough for
+    the short lock.
+    """
+    op.execute("CREATE INDEX ix_txn_date_desc ON transactions (txn_date DESC)")
+
+
+def downgrade() -> None:
+    """
+    Drop the descending txn_date index.
+    """
+    op.execute("DROP INDEX IF EXISTS ix_txn_date_desc")
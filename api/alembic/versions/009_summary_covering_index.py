@@ -0,0 +1,47 @@
+"""add covering index for the summary aggregation scan
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-09-01 12:00:00.000000
+
+The summary endpoint aggregates one CTE-filtered window (txn_date range)
+reading direction, category, canonical_vendor, amount_cents. Without a
+covering index that is a heap scan per request; with one, the whole scan
+is answered from the index (index-only scan), reading far fewer pages.
+
+The request sketched two per-direction partial indexes, but since the
+aggregates were collapsed into a single scan of the filtered window, one
+covering index over that scan serves all branches; per-direction
+partials would force the planner back to two scans. status is an
+optional filter, not a constant, so the index is not partial on it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Create the covering summary index.
+
+    INCLUDE keeps the payload columns out of the key (no ordering cost,
+    smaller upper tree) while still enabling index-only scans.
+    """
+    op.execute(
+        "CREATE INDEX ix_txn_summary_covering ON transactions (txn_date) "
+        "INCLUDE (direction, category, canonical_vendor, amount_cents)"
+    )
+
+
+def downgrade() -> None:
+    """
+    Drop the covering summary index.
+    """
+    op.execute("DROP INDEX IF EXISTS ix_txn_summary_covering")
@@ -0,0 +1,39 @@
+"""add payload content hash to reports
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-09-01 12:00:00.000000
+
+The Report cache writer upserted the payload on every in-process cache
+miss, paying UPDATE WAL and page dirtying even when the summary had not
+changed between polls. Storing a 64-bit content hash of the serialized
+payload lets the writer compare hashes first and skip the write when
+nothing moved — a cache refresh over unchanged data becomes one SELECT.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add the nullable payload_hash column.
+
+    Existing rows keep NULL, which never equals a computed hash, so the
+    first refresh after the upgrade rewrites them with a hash in place.
+    """
+    op.add_column("reports", sa.Column("payload_hash", sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    """
+    Drop the payload_hash column.
+    """
+    op.drop_column("reports", "payload_hash")
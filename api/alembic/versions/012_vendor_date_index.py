@@ -0,0 +1,40 @@
+"""add composite vendor/date index for the new-vendor ranking
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-09-01 12:00:00.000000
+
+The new-vendor alert ranks each vendor's transactions by txn_date with a
+window function (row_number() = 1 is the first charge). A composite
+(canonical_vendor, txn_date) index lets the partition read rows already
+grouped and ordered, so the window needs no sort and the planner can
+walk index prefixes instead of scanning the table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '012'
+down_revision: Union[str, None] = '011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add the composite (canonical_vendor, txn_date) index.
+    """
+    op.create_index(
+        "ix_txn_vendor_date",
+        "transactions",
+        ["canonical_vendor", "txn_date"],
+    )
+
+
+def downgrade() -> None:
+    """
+    Drop the composite index.
+    """
+    op.drop_index("ix_txn_vendor_date", table_name="transactions")
@@ -0,0 +1,46 @@
+"""add partial index for the missing-receipt alert scan
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-09-01 12:00:00.000000
+
+The missing-receipt alert selects the top N unreceipted debits by
+amount. Without an index matching that predicate the query sorts every
+qualifying row; a partial (amount_cents DESC) index over
+receipt_url IS NULL AND direction = 'debit' rows lets the LIMIT stop
+after reading the first N entries, and stays small because receipted
+and credit rows never enter it.
+
+The other detector predicates already have matching indexes: the review
+queue uses the ix_txn_review partial, category/date scans use
+ix_txn_date_cat, the vendor ranking uses ix_txn_vendor_date, and the
+date/direction aggregates are covered by ix_txn_summary_covering.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '013'
+down_revision: Union[str, None] = '012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add the partial missing-receipt index.
+    """
+    op.execute(
+        "CREATE INDEX ix_txn_missing_receipt "
+        "ON transactions (amount_cents DESC) "
+        "WHERE receipt_url IS NULL AND direction = 'debit'"
+    )
+
+
+def downgrade() -> None:
+    """
+    Drop the partial missing-receipt index.
+    """
+    op.drop_index("ix_txn_missing_receipt", table_name="transactions")
@@ -0,0 +1,46 @@
+"""make the reports (period, kind) index unique
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-09-01 12:00:00.000000
+
+The report cache writer upserts with ON CONFLICT (period, kind), but
+001 created ix_reports_period_kind as a plain non-unique index, so
+arbiter inference failed on every write, the writer's error handling
+swallowed the failure, and the reports table never received a row.
+Replace the plain index with a unique one. kind leads the column order
+so the same index also serves the latest-per-kind dashboard lookup
+(kind = ? ORDER BY period DESC reads the index backward); ON CONFLICT
+inference matches the column set regardless of order.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '014'
+down_revision: Union[str, None] = '013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Replace the plain (period, kind) index with a unique (kind, period) one.
+    """
+    op.drop_index('ix_reports_period_kind', table_name='reports')
+    op.create_index(
+        'uq_reports_kind_period',
+        'reports',
+        ['kind', 'period'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """
+    Restore the plain (period, kind) index.
+    """
+    op.drop_index('uq_reports_kind_period', table_name='reports')
+    op.create_index('ix_reports_period_kind', 'reports', ['period', 'kind'])
@@ -0,0 +1,41 @@
+"""drop the kind/period DESC index superseded by the unique index
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-09-01 12:00:00.000000
+
+005 added ix_reports_kind_period_desc for the latest-per-kind lookup at
+a time when the reports table was never actually written (the cache
+upsert had no unique arbiter until 014). The unique (kind, period)
+index from 014 serves that same lookup — kind = ? ORDER BY period DESC
+is a backward scan of the kind range — so the DESC twin is pure write
+amplification on every cache upsert. The payload GIN index from 005
+stays: containment filters on the cached document have no other index,
+and the table now receives rows for it to serve.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '015'
+down_revision: Union[str, None] = '014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Drop the redundant (kind, period DESC) index.
+    """
+    op.drop_index('ix_reports_kind_period_desc', table_name='reports')
+
+
+def downgrade() -> None:
+    """
+    Restore the (kind, period DESC) index.
+    """
+    op.execute(
+        "CREATE INDEX ix_reports_kind_period_desc ON reports (kind, period DESC)"
+    )
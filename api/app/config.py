@@ -1,6 +1,7 @@
 """
 Application configuration using pydantic-settings.
 """
+from functools import cached_property, lru_cache
 from typing import List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -12,10 +13,15 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: int = 30
 
     # OpenAI
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = "gpt-4o-mini"
+    OPENAI_MAX_CONCURRENCY: int = 8  # Parallel calls in bulk categorization
 
     # Security
     JWT_SECRET: str
@@ -28,17 +34,31 @@ class Settings(BaseSettings):
     # Optional
     TELEGRAM_WEBHOOK_URL: str | None = None
 
+    # Development mode (enables template auto-reload)
+    DEBUG: bool = False
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=True
     )
 
-    @property
+    @cached_property
     def allowed_origins_list(self) -> List[str]:
-        """Parse comma-separated ALLOWED_ORIGINS into a list."""
+        """Parse comma-separated ALLOWED_ORIGINS into a list (computed once)."""
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the process-wide Settings instance.
+
+    Cached so repeated calls (and test code constructing settings on
+    demand) don't re-read and re-validate the .env file.
+    """
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
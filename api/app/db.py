@@ -14,13 +14,53 @@ if database_url.startswith("postgresql://"):
 elif database_url.startswith("postgresql+psycopg2://"):
     database_url = database_url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
 
-# Create async engine
+# asyncpg-specific connection knobs:
+# - prepared_statement_cache_size: reuse binary-protocol prepared plans
+#   across requests (SQLAlchemy manages the cache, so this is its knob
+#   rather than asyncpg's raw statement_cache_size). 2000 comfortably
+#   holds every distinct hot statement (per-id lookups, upserts, report
+#   aggregates) so point reads like the categorize SELECT skip the PG
+#   parse/plan step entirely.
+#   CAVEAT: prepared statements are per-server-connection. Behind
+#   PgBouncer in transaction-pooling mode they break ("prepared
+#   statement does not exist"); either run PgBouncer in session mode or
+#   set this to 0. We connect to PostgreSQL directly, so the cache stays
+#   on.
+# - command_timeout: bound straggler queries instead of holding a pool
+#   slot indefinitely
+# - jit off: avoids PostgreSQL JIT warmup latency on short OLTP queries
+connect_args = {}
+if database_url.startswith("postgresql+asyncpg://"):
+    connect_args = {
+        "prepared_statement_cache_size": 2000,
+        "command_timeout": 30,
+        "server_settings": {
+            "jit": "off",
+            "application_name": "finance-api",
+        },
+    }
+
+# Create async engine with a persistent connection pool. NullPool is kept
+# only for Alembic's one-shot migration connections (see alembic/env.py);
+# the app re-uses authenticated connections across requests.
 engine = create_async_engine(
     database_url,
     echo=False,
+    # The reports/rules JSONB queries compile to many distinct statements;
+    # the default 500-entry compiled-SQL cache churns under that mix, so
+    # size it up. Only 2.0-style select()/insert()/update() constructs hit
+    # this cache — the routers use them exclusively.
+    query_cache_size=2000,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    connect_args=connect_args,
+    # Page multi-row INSERTs at PostgreSQL's sweet spot so every bulk
+    # write (ingest batches, report caching) chunks optimally without
+    # per-statement options
+    execution_options={"insertmanyvalues_page_size": 1000},
 )
 
 # Create async session factory
@@ -5,14 +5,19 @@ from typing import AsyncGenerator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from jose import JWTError, jwt
+import jwt
 
-from app.db import get_db
+from app.db import AsyncSessionLocal, get_db
 from app.config import settings
 
 # Security
 security = HTTPBearer(auto_error=False)
 
+# PyJWT instance and algorithm list built once; decode goes through
+# cryptography's OpenSSL-backed HMAC rather than a pure-Python HMAC loop.
+_JWT = jwt.PyJWT()
+_JWT_ALGORITHMS = ["HS256"]
+
 
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
@@ -40,13 +45,13 @@ async def get_current_user(
     token = credentials.credentials
 
     try:
-        payload = jwt.decode(
+        payload = _JWT.decode(
             token,
             settings.JWT_SECRET,
-            algorithms=["HS256"]
+            algorithms=_JWT_ALGORITHMS
         )
         return payload
-    except JWTError as e:
+    except jwt.InvalidTokenError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
@@ -83,5 +88,16 @@ async def require_auth(
     return user
 
 
+def get_session_factory():
+    """
+    Dependency providing the session factory itself.
+
+    Background tasks outlive the request-scoped session from get_db, so
+    they open their own short-lived session from this factory. Tests
+    override it with a factory bound to the in-memory engine.
+    """
+    return AsyncSessionLocal
+
+
 # Re-export get_db for convenience
-__all__ = ["get_db", "get_current_user", "require_auth"]
+__all__ = ["get_db", "get_current_user", "require_auth", "get_session_factory"]
@@ -1,32 +1,77 @@
 """
 FastAPI application for Personal Finance Automation.
 """
+import atexit
+import gzip
+import hashlib
 import logging
+import mimetypes
+import queue
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
+from app import categorize as categorize_service
 from app.config import settings
-from app.db import engine, get_db
+from app.db import engine
 from app.routers import ingest, categorize, reports, alerts
 
 # Template and static file paths
 BASE_DIR = Path(__file__).resolve().parent
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 static_dir = BASE_DIR / "static"
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# Hand-built Jinja2 environment: auto_reload off outside DEBUG (skips the
+# per-request template stat) and compiled templates cached on disk so worker
+# restarts don't re-parse them. FileSystemBytecodeCache creates its own
+# per-user directory under the system tempdir when none is given.
+_jinja_env = Environment(
+    loader=FileSystemLoader(str(BASE_DIR / "templates")),
+    auto_reload=settings.DEBUG,
+    bytecode_cache=FileSystemBytecodeCache(),
+    autoescape=True,
 )
+templates = Jinja2Templates(env=_jinja_env)
+
+# In-memory static asset cache: path -> (body, gzipped body, ETag, content type).
+# Built once at startup so serving an asset does zero disk I/O and the gzip
+# work is paid at boot instead of per request.
+_static_cache: Dict[str, tuple[bytes, bytes, str, str]] = {}
+
+
+def _build_static_cache() -> None:
+    """Precompute body, gzip body, ETag and content type for every static asset."""
+    for file_path in static_dir.rglob("*"):
+        if not file_path.is_file():
+            continue
+        body = file_path.read_bytes()
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        content_type = (
+            mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+        )
+        key = file_path.relative_to(static_dir).as_posix()
+        _static_cache[key] = (body, gzip.compress(body), etag, content_type)
+
+# Configure logging through a queue so formatting and stderr writes happen
+# on a background thread instead of blocking the event loop.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+)
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
+_log_listener = QueueListener(_log_queue, _stream_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,11 +86,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     logger.info("Starting Finance Automation API")
     logger.info(f"Database: {settings.DATABASE_URL.split('@')[-1]}")  # Log DB without credentials
     logger.info(f"OpenAI Model: {settings.OPENAI_MODEL}")
+    _build_static_cache()
+    categorize_service.start_batcher()
 
     yield
 
     # Shutdown
     logger.info("Shutting down Finance Automation API")
+    await categorize_service.stop_batcher()
+    await categorize_service.close_http_client()
     await engine.dispose()
     logger.info("Database connections closed")
 
@@ -71,7 +120,8 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -84,25 +134,36 @@ app.add_middleware(
 )
 
 
-# Exception handlers
+# Exception handling: one consolidated handler with one registration per
+# handled type. Registering for bare Exception would move these out of
+# Starlette's ExceptionMiddleware into ServerErrorMiddleware, which
+# re-raises after responding — every handled DB/validation error would
+# still surface as an unhandled ASGI exception to the server. Explicit
+# registrations keep the handled types inside ExceptionMiddleware (which
+# resolves by MRO, so subclasses land here too) and leave everything
+# else on the default 500 path.
 @app.exception_handler(SQLAlchemyError)
-async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
-    """Handle database errors."""
-    logger.error(f"Database error: {exc}")
-    return JSONResponse(
-        status_code=500,
-        content={
-            "detail": "Database error occurred",
-            "type": "database_error"
-        }
-    )
-
-
 @app.exception_handler(ValueError)
-async def value_error_handler(request: Request, exc: ValueError):
-    """Handle validation errors."""
-    logger.error(f"Validation error: {exc}")
-    return JSONResponse(
+@app.exception_handler(HTTPException)
+async def app_exception_handler(request: Request, exc: Exception):
+    """Dispatch application exceptions to their JSON responses."""
+    if isinstance(exc, HTTPException):
+        logger.warning("HTTP %s: %s", exc.status_code, exc.detail)
+        return ORJSONResponse(
+            status_code=exc.status_code,
+            content={"detail": exc.detail}
+        )
+    if isinstance(exc, SQLAlchemyError):
+        logger.error("Database error: %s", exc)
+        return ORJSONResponse(
+            status_code=500,
+            content={
+                "detail": "Database error occurred",
+                "type": "database_error"
+            }
+        )
+    logger.error("Validation error: %s", exc)
+    return ORJSONResponse(
         status_code=400,
         content={
             "detail": str(exc),
@@ -111,18 +172,29 @@ async def value_error_handler(request: Request, exc: ValueError):
     )
 
 
-@app.exception_handler(HTTPException)
-async def http_exception_handler(request: Request, exc: HTTPException):
-    """Handle HTTP exceptions with logging."""
-    logger.warning(f"HTTP {exc.status_code}: {exc.detail}")
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail}
-    )
+# Static assets served from the precomputed in-memory cache (no per-request
+# stat()/open()/thread-pool hop like Starlette's StaticFiles). The route keeps
+# the name "static" so url_for('static', path=...) in templates still resolves.
+@app.get("/static/{path:path}", name="static", include_in_schema=False)
+async def static_asset(path: str, request: Request) -> Response:
+    """Serve a precomputed static asset with ETag and gzip support."""
+    if not _static_cache:
+        # Test clients created without the lifespan still get assets.
+        _build_static_cache()
+
+    asset = _static_cache.get(path)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not Found")
 
+    body, gzipped, etag, content_type = asset
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
 
-# Mount static files
-app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600", "Vary": "Accept-Encoding"}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=gzipped, media_type=content_type, headers=headers)
+    return Response(content=body, media_type=content_type, headers=headers)
 
 
 # Root endpoint - Dashboard
@@ -189,18 +261,17 @@ async def health_check():
         "version": "1.0.0"
     }
 
-    # Check database connection
+    # Check database connection straight from the engine pool -- no need to
+    # spin up a full ORM session (and its commit/rollback teardown) here.
     try:
-        async for db in get_db():
-            # Simple query to test connection
-            await db.execute("SELECT 1")
-            health_status["database"] = "connected"
-            break
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        health_status["database"] = "connected"
     except Exception as e:
         logger.error(f"Health check failed - database error: {e}")
         health_status["status"] = "unhealthy"
         health_status["database"] = f"error: {str(e)}"
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content=health_status
         )
@@ -233,14 +304,20 @@ app.include_router(
     tags=["Alerts"]
 )
 
+# Also expose the API contract paths without the /api prefix
+# (POST /ingest, GET /report/summary, ...) for n8n and dashboard clients.
+for _router in (ingest.router, categorize.router, reports.router, alerts.router):
+    app.include_router(_router, include_in_schema=False)
+
 
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log all requests."""
-    logger.info(f"{request.method} {request.url.path}")
+    """Log completed requests with deferred %s formatting."""
     response = await call_next(request)
-    logger.info(f"{request.method} {request.url.path} - {response.status_code}")
+    logger.info(
+        "%s %s - %s", request.method, request.url.path, response.status_code
+    )
     return response
 
 
@@ -3,9 +3,11 @@ SQLAlchemy ORM models for the finance automation system.
 """
 from datetime import date, datetime
 from decimal import Decimal
+from functools import cached_property
 from typing import Optional
 
 from sqlalchemy import (
+    JSON,
     BigInteger,
     Boolean,
     CheckConstraint,
@@ -13,16 +15,51 @@ from sqlalchemy import (
     Date,
     Index,
     Integer,
-    Numeric,
+    LargeBinary,
+    SmallInteger,
     String,
     Text,
+    TypeDecorator,
     ARRAY,
+    desc,
 )
-from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMPTZ
-from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import JSONB as PG_JSONB, TIMESTAMP
+from sqlalchemy.sql import func, text
 
 from app.db import Base
 
+# Portable type aliases: PostgreSQL-native in production, with SQLite
+# fallbacks so the in-memory test database can create the schema.
+TIMESTAMPTZ = TIMESTAMP(timezone=True)
+JSONB = PG_JSONB().with_variant(JSON(), "sqlite")
+TextArray = ARRAY(Text).with_variant(JSON(), "sqlite")
+BigIntPK = BigInteger().with_variant(Integer(), "sqlite")
+
+
+class HashId(TypeDecorator):
+    """
+    SHA-256 dedup key stored as raw 32 bytes, exposed to Python as hex.
+
+    Storing the digest instead of its 64-char hex text halves the bytes
+    per row in the unique index, so more of the ON CONFLICT probe's index
+    stays in shared_buffers. Application code (and the API contract)
+    keeps passing hex strings; the conversion happens at the bind/result
+    boundary.
+    """
+
+    impl = LargeBinary(32)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return bytes.fromhex(value) if isinstance(value, str) else value
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return value.hex()
+
 
 class Transaction(Base):
     """
@@ -44,15 +81,15 @@ class Transaction(Base):
         receipt_url: URL to receipt in Google Drive
         category: Primary category (e.g., 'Groceries')
         subcategory: Secondary category (e.g., 'Supermarket')
-        confidence: Categorization confidence score (0.00-1.00)
+        confidence_bp: Categorization confidence in basis points (0-10000)
         status: Transaction status ('ingested', 'review', 'finalized')
         notes: User notes or system annotations
     """
 
     __tablename__ = "transactions"
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
-    txn_date = Column(Date, nullable=False, index=True)
+    id = Column(BigIntPK, primary_key=True, autoincrement=True)
+    txn_date = Column(Date, nullable=False)
     posted_at = Column(TIMESTAMPTZ, nullable=False, server_default=func.now())
     amount_cents = Column(BigInteger, nullable=False)
     currency = Column(Text, nullable=False, default="USD")
@@ -62,25 +99,88 @@ class Transaction(Base):
         nullable=False,
     )
     raw_descriptor = Column(Text, nullable=False)
-    canonical_vendor = Column(Text, nullable=True, index=True)
+    canonical_vendor = Column(Text, nullable=True)
     mcc = Column(Text, nullable=True)
     memo = Column(Text, nullable=True)
     source_account = Column(Text, nullable=False)
-    hash_id = Column(Text, nullable=False, unique=True, index=True)
+    hash_id = Column(HashId, nullable=False, unique=True, index=True)
     receipt_url = Column(Text, nullable=True)
-    category = Column(Text, nullable=True, index=True)
+    category = Column(Text, nullable=True)
     subcategory = Column(Text, nullable=True)
-    confidence = Column(Numeric(3, 2), nullable=True)
+    # Basis points (0-10000) instead of Numeric(3,2): integer compares on
+    # the categorize hot path, no per-row Decimal allocation (migration 007)
+    confidence_bp = Column(SmallInteger, nullable=True)
     status = Column(Text, nullable=False, default="ingested")
     notes = Column(Text, nullable=True)
 
     __table_args__ = (
-        Index("ix_transactions_txn_date", "txn_date"),
+        # BRIN: txn_date correlates with insertion order, and the report
+        # queries are all date-range scans (see migration 003). SQLite
+        # ignores the USING clause and builds a plain index.
+        Index(
+            "ix_transactions_txn_date_brin",
+            "txn_date",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
         Index("ix_transactions_canonical_vendor", "canonical_vendor"),
+        # Serves the new-vendor ranking window (partition by vendor,
+        # order by txn_date) without a sort (see migration 012)
+        Index("ix_txn_vendor_date", "canonical_vendor", "txn_date"),
         Index("ix_transactions_category", "category"),
-        Index("ix_transactions_status", "status"),
+        # Partial index over the small unfinalized fraction of the table,
+        # covering the review-queue scans (see migration 002)
+        Index(
+            "ix_txn_review",
+            "txn_date",
+            postgresql_where=text("status IN ('ingested', 'review')"),
+        ),
+        Index("ix_txn_date_cat", "txn_date", "category"),
+        # Partial top-N index for the missing-receipt alert: ORDER BY
+        # amount_cents DESC LIMIT n over unreceipted debits stops at the
+        # first n index entries (see migration 013)
+        Index(
+            "ix_txn_missing_receipt",
+            desc("amount_cents"),
+            postgresql_where=text(
+                "receipt_url IS NULL AND direction = 'debit'"
+            ),
+        ),
+        # Ordered B-Tree for the dashboard's latest-N scan; the BRIN above
+        # cannot serve ORDER BY txn_date DESC LIMIT n (see migration 008)
+        Index("ix_txn_date_desc", desc("txn_date")),
+        # Covers the summary endpoint's single filtered scan so the
+        # aggregation runs as an index-only scan (see migration 009).
+        # SQLite ignores the INCLUDE list and builds a plain index.
+        Index(
+            "ix_txn_summary_covering",
+            "txn_date",
+            postgresql_include=[
+                "direction", "category", "canonical_vendor", "amount_cents",
+            ],
+        ),
     )
 
+    @cached_property
+    def raw_descriptor_lower(self) -> str:
+        """
+        Lowercased descriptor, computed once per instance.
+
+        Every contains rule and the automaton scan compare against the
+        lowered descriptor; caching it here turns M lowercase walks per
+        rule evaluation into one. The cache is per instance, so a
+        descriptor rewritten through plain SQL (e.g. the re-ingest
+        upsert) is only reflected on a freshly loaded object.
+        """
+        return self.raw_descriptor.lower()
+
+    @property
+    def confidence(self) -> Optional[float]:
+        """Confidence as a 0.0-1.0 float, derived from basis points."""
+        if self.confidence_bp is None:
+            return None
+        return self.confidence_bp / 10_000
+
     def __repr__(self) -> str:
         return (
             f"<Transaction(id={self.id}, date={self.txn_date}, "
@@ -104,7 +204,7 @@ class Vendor(Base):
     canonical_vendor = Column(Text, primary_key=True)
     default_category = Column(Text, nullable=True)
     default_subcat = Column(Text, nullable=True)
-    aliases = Column(ARRAY(Text), nullable=True, default=list)
+    aliases = Column(TextArray, nullable=True, default=list)
 
     def __repr__(self) -> str:
         return (
@@ -136,14 +236,26 @@ class Rule(Base):
 
     __tablename__ = "rules"
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntPK, primary_key=True, autoincrement=True)
     priority = Column(Integer, nullable=False, index=True)
     condition = Column(JSONB, nullable=False)
     action = Column(JSONB, nullable=False)
     active = Column(Boolean, nullable=False, default=True)
     created_at = Column(TIMESTAMPTZ, nullable=False, server_default=func.now())
 
-    __table_args__ = (Index("ix_rules_active_priority", "active", "priority"),)
+    __table_args__ = (
+        Index("ix_rules_active_priority", "active", "priority"),
+        # GIN with jsonb_path_ops serves @> containment lookups on the
+        # condition document (e.g. finding rules for a given MCC/account)
+        # at about half the size of the default jsonb_ops opclass. SQLite
+        # ignores the PostgreSQL options and builds a plain index.
+        Index(
+            "ix_rules_condition_gin",
+            "condition",
+            postgresql_using="gin",
+            postgresql_ops={"condition": "jsonb_path_ops"},
+        ),
+    )
 
     def __repr__(self) -> str:
         return f"<Rule(id={self.id}, priority={self.priority}, active={self.active})>"
@@ -153,23 +265,44 @@ class Report(Base):
     """
     Represents a cached report for performance optimization.
 
+    The table is UNLOGGED in production (migration 011): it is a pure
+    cache rebuildable from transactions, so its writes skip WAL and it
+    is truncated on crash recovery rather than replayed.
+
     Attributes:
         id: Unique report identifier
         period: Report period identifier (e.g., '2025-10', '2025-W42')
         kind: Report type ('weekly', 'monthly', 'yearly')
         payload: JSONB report data
+        payload_hash: 64-bit content hash of the serialized payload
         created_at: Timestamp when report was generated
     """
 
     __tablename__ = "reports"
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntPK, primary_key=True, autoincrement=True)
     period = Column(Text, nullable=False, index=True)
     kind = Column(Text, nullable=False)
     payload = Column(JSONB, nullable=False)
+    # Content hash of the serialized payload; lets the cache writer skip
+    # the UPSERT entirely when the summary has not changed (migration 010)
+    payload_hash = Column(BigInteger, nullable=True)
     created_at = Column(TIMESTAMPTZ, nullable=False, server_default=func.now())
 
-    __table_args__ = (Index("ix_reports_period_kind", "period", "kind"),)
+    __table_args__ = (
+        # Unique: the arbiter for the cache writer's ON CONFLICT
+        # (period, kind) upsert. kind leads so the index also serves the
+        # latest-per-kind ordered lookup — kind = ? ORDER BY period DESC
+        # reads it backward (see migrations 014 and 015).
+        Index("uq_reports_kind_period", "kind", "period", unique=True),
+        # @> containment filters on the cached payload document
+        Index(
+            "ix_reports_payload_gin",
+            "payload",
+            postgresql_using="gin",
+            postgresql_ops={"payload": "jsonb_path_ops"},
+        ),
+    )
 
     def __repr__(self) -> str:
         return f"<Report(id={self.id}, period={self.period}, kind={self.kind})>"
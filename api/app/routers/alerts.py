@@ -71,9 +71,8 @@ async def get_alerts(
 
     Process:
         1. Determine date range (default: last 30 days)
-        2. Run anomaly detection service
-        3. Filter by severity if specified
-        4. Return alerts
+        2. Run anomaly detection service (severity filter applied in SQL)
+        3. Return alerts
     """
     try:
         # Default date range: last 30 days
@@ -89,12 +88,9 @@ async def get_alerts(
                 detail="start_date must be before end_date"
             )
 
-        # Detect anomalies
-        alerts = await detect_anomalies(db, start_date, end_date)
-
-        # Filter by severity if specified
-        if severity:
-            alerts = [a for a in alerts if a.severity == severity]
+        # Detect anomalies; the severity filter is pushed down into the
+        # detection queries rather than filtering here in Python
+        alerts = await detect_anomalies(db, start_date, end_date, severity=severity)
 
         logger.info(
             f"Generated {len(alerts)} alerts for period "
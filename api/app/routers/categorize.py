@@ -1,22 +1,194 @@
 """
 Transaction categorization router.
 """
+import asyncio
 import logging
-from decimal import Decimal
+from typing import List
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, select, update
 
 from app.deps import get_db
 from app.models import Transaction
 from app.schemas import CategorizeOut, FinalizeRequest, FinalizeResponse
-from app.categorize import categorize_transaction
+from app.categorize import categorize_with_ai, categorize_with_openai, match_rule_only
 from app.config import settings
+from app.services.rules_cache import get_rule_matcher
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Review threshold in basis points, converted once at import; the status
+# check below is then a plain integer compare
+_LOW_CONFIDENCE_BP = int(settings.LOW_CONFIDENCE * 10_000)
+
+# The columns the rules predicates and the OpenAI prompt read — selected
+# as plain Rows, no ORM instance creation
+_TXN_COLUMNS = (
+    Transaction.id,
+    Transaction.txn_date,
+    Transaction.amount_cents,
+    Transaction.currency,
+    Transaction.direction,
+    Transaction.raw_descriptor,
+    Transaction.memo,
+    Transaction.mcc,
+    Transaction.source_account,
+    Transaction.canonical_vendor,
+    # Lowered once by the database; the rule matcher reads this instead
+    # of re-lowering the descriptor per row
+    func.lower(Transaction.raw_descriptor).label("raw_descriptor_lower"),
+)
+
+
+@router.post(
+    "/categorize/bulk",
+    response_model=List[CategorizeOut],
+    summary="Categorize a batch of transactions",
+    description="""
+    Categorize a batch of transactions in one pass.
+
+    - Applies deterministic rules to every row first
+    - Remaining rows fan out to OpenAI with bounded concurrency
+    - Writes all results with one executemany UPDATE
+    - Unknown ids and rows whose AI call failed are skipped, not errors
+
+    **Authentication**: Not required (called by n8n workflow)
+    """,
+    responses={
+        200: {
+            "description": "Batch categorized successfully"
+        },
+        500: {
+            "description": "Categorization failed"
+        }
+    }
+)
+async def categorize_bulk(
+    transaction_ids: List[int],
+    db: AsyncSession = Depends(get_db)
+) -> List[CategorizeOut]:
+    """
+    Categorize a batch of transactions.
+
+    Process:
+        1. Load the needed columns for all ids in one SELECT
+        2. Partition into rule hits and AI-needed rows
+        3. Run OpenAI calls concurrently under a semaphore — the batch
+           latency is the slowest call, not the sum
+        4. Write every result with a single executemany UPDATE
+    """
+    if not transaction_ids:
+        return []
+
+    try:
+        result = await db.execute(
+            select(*_TXN_COLUMNS).where(Transaction.id.in_(transaction_ids))
+        )
+        rows = result.all()
+
+        # Rule pass over the whole batch with one rule-matcher load
+        matcher = await get_rule_matcher(db)
+        categorizations = {}
+        ai_needed = []
+        for row in rows:
+            rule = matcher.first_match(row)
+            if rule is not None:
+                categorizations[row.id] = {
+                    "category": rule.action.get("category"),
+                    "subcategory": rule.action.get("subcategory"),
+                    "confidence_bp": 10_000,
+                }
+            else:
+                ai_needed.append(row)
+        rule_hits = len(categorizations)
+
+        # Bounded fan-out: overlap the network-bound OpenAI calls without
+        # stampeding the rate limit
+        if ai_needed:
+            semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+
+            async def _guarded(txn):
+                async with semaphore:
+                    return await categorize_with_openai(txn)
+
+            results = await asyncio.gather(
+                *(_guarded(row) for row in ai_needed),
+                return_exceptions=True,
+            )
+            for row, res in zip(ai_needed, results):
+                if isinstance(res, BaseException):
+                    logger.error(
+                        f"AI categorization failed for transaction {row.id}: {res}"
+                    )
+                    continue
+                categorizations[row.id] = res
+
+        params = []
+        out = []
+        for row in rows:
+            categorization = categorizations.get(row.id)
+            if categorization is None:
+                continue
+            needs_review = (
+                categorization["confidence_bp"] < _LOW_CONFIDENCE_BP
+                or row.amount_cents > settings.REVIEW_AMOUNT_CENTS
+            )
+            new_status = "review" if needs_review else "finalized"
+            params.append({
+                "b_id": row.id,
+                "b_category": categorization["category"],
+                "b_subcategory": categorization.get("subcategory"),
+                "b_confidence_bp": categorization["confidence_bp"],
+                "b_status": new_status,
+                "b_vendor": row.canonical_vendor or categorization.get("vendor"),
+            })
+            out.append(CategorizeOut(
+                id=row.id,
+                category=categorization["category"],
+                subcategory=categorization.get("subcategory"),
+                confidence=categorization["confidence_bp"] / 10_000,
+                status=new_status,
+            ))
+
+        if params:
+            # One executemany UPDATE driven by bindparams instead of a
+            # statement per row
+            stmt = (
+                update(Transaction)
+                .where(Transaction.id == bindparam("b_id"))
+                .values(
+                    category=bindparam("b_category"),
+                    subcategory=bindparam("b_subcategory"),
+                    confidence_bp=bindparam("b_confidence_bp"),
+                    status=bindparam("b_status"),
+                    canonical_vendor=bindparam("b_vendor"),
+                )
+            )
+            # Execute at the connection (Core) level: the session's ORM
+            # bulk-update path would demand primary-key dicts and identity
+            # map synchronization neither of which applies here
+            connection = await db.connection()
+            await connection.execute(stmt, params)
+        await db.commit()
+
+        logger.info(
+            "Bulk categorized %s transactions (%s via rules, %s via AI)",
+            len(out), rule_hits, len(out) - rule_hits,
+        )
+
+        return out
+
+    except Exception as e:
+        logger.error(f"Error bulk categorizing transactions: {e}")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to categorize transactions"
+        ) from e
+
 
 @router.post(
     "/categorize/{transaction_id}",
@@ -69,62 +241,74 @@ async def categorize(
     Categorize a transaction.
 
     Process:
-        1. Load transaction from database
+        1. Load the columns rules and AI need (no ORM instance)
         2. Apply rules engine (deterministic)
         3. Fallback to OpenAI if no rule matches
-        4. Update transaction with category, subcategory, confidence
-        5. Set status based on confidence and amount
-        6. Return categorization result
+        4. Write category, subcategory, confidence, status in one UPDATE
+        5. Return categorization result
     """
     try:
-        # Load transaction
+        # Lean column select: the rules predicates and the OpenAI prompt
+        # only read these fields, so skip ORM instance creation and the
+        # unit-of-work dirty tracking that comes with it
         result = await db.execute(
-            select(Transaction).where(Transaction.id == transaction_id)
+            select(*_TXN_COLUMNS).where(Transaction.id == transaction_id)
         )
-        transaction = result.scalar_one_or_none()
+        transaction = result.first()
 
-        if not transaction:
+        if transaction is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Transaction not found"
             )
 
-        # Categorize transaction
-        categorization = await categorize_transaction(transaction, db)
-
-        # Update transaction
-        transaction.category = categorization["category"]
-        transaction.subcategory = categorization.get("subcategory")
-        transaction.confidence = categorization["confidence"]
-
-        # Update canonical vendor if provided by AI
-        if categorization.get("vendor") and not transaction.canonical_vendor:
-            transaction.canonical_vendor = categorization["vendor"]
+        # Cheap deterministic pass first; the AI path (prompt build, cache
+        # lock, batcher handoff) is only entered on a rule miss
+        categorization = await match_rule_only(transaction, db)
+        if categorization is None:
+            categorization = await categorize_with_ai(transaction)
 
-        # Determine status
+        # Determine status (integer basis-point compare)
         needs_review = (
-            categorization["confidence"] < Decimal(str(settings.LOW_CONFIDENCE))
+            categorization["confidence_bp"] < _LOW_CONFIDENCE_BP
             or transaction.amount_cents > settings.REVIEW_AMOUNT_CENTS
         )
+        new_status = "review" if needs_review else "finalized"
 
-        transaction.status = "review" if needs_review else "finalized"
+        values = {
+            "category": categorization["category"],
+            "subcategory": categorization.get("subcategory"),
+            "confidence_bp": categorization["confidence_bp"],
+            "status": new_status,
+        }
+        # Update canonical vendor if provided by AI
+        if categorization.get("vendor") and not transaction.canonical_vendor:
+            values["canonical_vendor"] = categorization["vendor"]
 
+        # Single Core UPDATE: only the four-or-five changed columns are
+        # compiled and sent, with no flush-time instance inspection
+        await db.execute(
+            update(Transaction)
+            .where(Transaction.id == transaction_id)
+            .values(**values)
+        )
         await db.commit()
-        await db.refresh(transaction)
 
         logger.info(
             f"Transaction {transaction_id} categorized: "
-            f"category={transaction.category}, "
-            f"confidence={transaction.confidence}, "
-            f"status={transaction.status}"
+            f"category={categorization['category']}, "
+            f"confidence_bp={categorization['confidence_bp']}, "
+            f"status={new_status}"
         )
 
+        # Every returned field was just assigned from known values, so
+        # reloading the row (db.refresh) would be a wasted round trip
         return CategorizeOut(
-            id=transaction.id,
-            category=transaction.category,
-            subcategory=transaction.subcategory,
-            confidence=transaction.confidence,
-            status=transaction.status
+            id=transaction_id,
+            category=categorization["category"],
+            subcategory=categorization.get("subcategory"),
+            confidence=categorization["confidence_bp"] / 10_000,
+            status=new_status
         )
 
     except HTTPException:
@@ -177,36 +361,37 @@ async def finalize(
     Finalize a transaction's category.
 
     Process:
-        1. Load transaction from database
-        2. Update category and subcategory
-        3. Set status to 'finalized'
-        4. Save changes
+        1. Update category, subcategory, status in one statement
+        2. 404 if no row matched the id
     """
     try:
-        # Load transaction
-        result = await db.execute(
-            select(Transaction).where(Transaction.id == transaction_id)
+        # Single UPDATE ... RETURNING: no separate existence SELECT and no
+        # ORM flush — one round trip instead of three
+        stmt = (
+            update(Transaction)
+            .where(Transaction.id == transaction_id)
+            .values(
+                category=finalize_data.category,
+                subcategory=finalize_data.subcategory,
+                status="finalized",
+                confidence_bp=10_000,  # User override = full confidence
+            )
+            .returning(Transaction.id)
         )
-        transaction = result.scalar_one_or_none()
+        result = await db.execute(stmt)
 
-        if not transaction:
+        if result.first() is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Transaction not found"
             )
 
-        # Update category
-        transaction.category = finalize_data.category
-        transaction.subcategory = finalize_data.subcategory
-        transaction.status = "finalized"
-        transaction.confidence = Decimal("1.00")  # User override = full confidence
-
         await db.commit()
 
         logger.info(
             f"Transaction {transaction_id} finalized: "
-            f"category={transaction.category}, "
-            f"subcategory={transaction.subcategory}"
+            f"category={finalize_data.category}, "
+            f"subcategory={finalize_data.subcategory}"
         )
 
         return FinalizeResponse(ok=True)
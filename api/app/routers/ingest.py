@@ -3,21 +3,23 @@ Transaction ingestion router.
 """
 import hashlib
 import logging
+from typing import Dict, List
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.dialects.postgresql import insert
 
+from app.db_bulk import bulk_upsert_transactions, transaction_upsert_stmt
 from app.deps import get_db
 from app.models import Transaction
-from app.schemas import TxnIn, IngestResponse
-from app.services.vendor_normalize import normalize_vendor
+from app.schemas import TxnIn, IngestResponse, BulkIngestResponse
+from app.services.rules_kernel import apply_rules_batch
+from app.services.vendor_normalize import normalize_vendor, normalize_vendors
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-
 def compute_hash_id(
     txn_date: str,
     amount_cents: int,
@@ -36,14 +38,99 @@ def compute_hash_id(
     Returns:
         SHA256 hash hex string
     """
-    data = f"{txn_date}|{amount_cents}|{descriptor}|{account}"
-    return hashlib.sha256(data.encode()).hexdigest()
+    # Feed the hasher field-by-field instead of building an f-string and
+    # encoding it per call; the byte stream (and digest) is unchanged.
+    # usedforsecurity=False opts into OpenSSL's fast non-FIPS path — this
+    # is a dedup key, not a security boundary.
+    h = hashlib.sha256(usedforsecurity=False)
+    h.update(txn_date.encode("ascii"))
+    h.update(b"|")
+    h.update(b"%d" % amount_cents)
+    h.update(b"|")
+    h.update(descriptor.encode())
+    h.update(b"|")
+    h.update(account.encode())
+    return h.hexdigest()
+
+
+def compute_hash_ids(txns: List[TxnIn]) -> List[str]:
+    """
+    Compute dedup hashes for a whole batch in one tight loop.
+
+    Rows that already carry a hash_id keep it. The constructor and
+    per-account encoded bytes are hoisted out of the loop so bulk ingest
+    pays interpreter overhead once, not per row; digests are identical
+    to compute_hash_id.
+
+    Args:
+        txns: Validated transaction inputs
+
+    Returns:
+        One hash hex string per input row, in order
+    """
+    sha256 = hashlib.sha256
+    account_bytes: Dict[str, bytes] = {}
+    hashes: List[str] = []
+
+    for txn in txns:
+        if txn.hash_id:
+            hashes.append(txn.hash_id)
+            continue
+
+        account = account_bytes.get(txn.source_account)
+        if account is None:
+            account = account_bytes[txn.source_account] = (
+                txn.source_account.encode()
+            )
+
+        h = sha256(usedforsecurity=False)
+        h.update(str(txn.txn_date).encode("ascii"))
+        h.update(b"|")
+        h.update(b"%d" % txn.amount_cents)
+        h.update(b"|")
+        h.update(txn.raw_descriptor.encode())
+        h.update(b"|")
+        h.update(account)
+        hashes.append(h.hexdigest())
+
+    return hashes
+
+
+def _build_txn_dict(
+    txn_data: TxnIn,
+    hash_id: str,
+    canonical_vendor: str | None
+) -> Dict:
+    """
+    Build the column dict for an upsert from validated input.
+
+    Args:
+        txn_data: Validated transaction input
+        hash_id: Deduplication hash (provided or computed)
+        canonical_vendor: Normalized vendor name, if resolved
+
+    Returns:
+        Dict of Transaction column values
+    """
+    return {
+        "txn_date": txn_data.txn_date,
+        "amount_cents": txn_data.amount_cents,
+        "currency": txn_data.currency,
+        "direction": txn_data.direction,
+        "raw_descriptor": txn_data.raw_descriptor,
+        "canonical_vendor": canonical_vendor,
+        "mcc": txn_data.mcc,
+        "memo": txn_data.memo,
+        "source_account": txn_data.source_account,
+        "hash_id": hash_id,
+        "status": "ingested"
+    }
 
 
 @router.post(
     "/ingest",
     response_model=IngestResponse,
-    status_code=status.HTTP_201_CREATED,
+    status_code=status.HTTP_200_OK,
     summary="Ingest a transaction",
     description="""
     Ingest a new transaction into the system.
@@ -56,7 +143,7 @@ def compute_hash_id(
     **Authentication**: Not required (called by n8n workflow)
     """,
     responses={
-        201: {
+        200: {
             "description": "Transaction ingested successfully",
             "content": {
                 "application/json": {
@@ -109,42 +196,22 @@ async def ingest_transaction(
             db
         )
 
-        # Prepare transaction data
-        txn_dict = {
-            "txn_date": txn_data.txn_date,
-            "amount_cents": txn_data.amount_cents,
-            "currency": txn_data.currency,
-            "direction": txn_data.direction,
-            "raw_descriptor": txn_data.raw_descriptor,
-            "canonical_vendor": canonical_vendor,
-            "mcc": txn_data.mcc,
-            "memo": txn_data.memo,
-            "source_account": txn_data.source_account,
-            "hash_id": hash_id,
-            "status": "ingested"
-        }
-
         # Upsert transaction
-        stmt = insert(Transaction).values(**txn_dict)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["hash_id"],
-            set_={
-                "txn_date": stmt.excluded.txn_date,
-                "amount_cents": stmt.excluded.amount_cents,
-                "currency": stmt.excluded.currency,
-                "direction": stmt.excluded.direction,
-                "raw_descriptor": stmt.excluded.raw_descriptor,
-                "canonical_vendor": stmt.excluded.canonical_vendor,
-                "mcc": stmt.excluded.mcc,
-                "memo": stmt.excluded.memo,
-                "source_account": stmt.excluded.source_account,
-            }
-        ).returning(Transaction.id)
+        stmt = transaction_upsert_stmt(
+            _build_txn_dict(txn_data, hash_id, canonical_vendor)
+        )
 
         result = await db.execute(stmt)
+        txn_id = result.scalar_one()
         await db.commit()
 
-        txn_id = result.scalar_one()
+        # The upsert runs at Core level, so refresh any ORM instance of this
+        # row that is already in the session identity map.
+        await db.execute(
+            select(Transaction)
+            .where(Transaction.id == txn_id)
+            .execution_options(populate_existing=True)
+        )
 
         logger.info(
             f"Transaction ingested: id={txn_id}, vendor={canonical_vendor}, "
@@ -166,3 +233,116 @@ async def ingest_transaction(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to ingest transaction"
         ) from e
+
+
+@router.post(
+    "/ingest/bulk",
+    response_model=BulkIngestResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Ingest a batch of transactions",
+    description="""
+    Ingest a batch of transactions in a single transaction.
+
+    - Computes hash_ids for deduplication where not provided
+    - Normalizes vendor names and applies deterministic rules batch-wise
+    - Upserts via COPY + stage-table merge (large batches) or one
+      INSERT ... ON CONFLICT statement
+    - Returns transaction IDs in input order
+
+    **Authentication**: Not required (called by n8n workflow)
+    """,
+    responses={
+        200: {
+            "description": "Batch ingested successfully",
+            "content": {
+                "application/json": {
+                    "example": {"ids": [123, 124, 125], "count": 3, "status": "ingested"}
+                }
+            }
+        },
+        400: {
+            "description": "Invalid request data"
+        },
+        500: {
+            "description": "Internal server error"
+        }
+    }
+)
+async def ingest_transactions_bulk(
+    txns: List[TxnIn],
+    db: AsyncSession = Depends(get_db)
+) -> BulkIngestResponse:
+    """
+    Ingest a batch of transactions, processed column-wise.
+
+    The batch is pulled apart into column lists once (struct-of-arrays),
+    so vendor resolution, hashing and rule matching each run as one batch
+    kernel pass instead of N per-row calls. Rows a deterministic rule
+    covers arrive pre-categorized at full confidence. The write goes
+    through bulk_upsert_transactions: COPY into a stage table merged with
+    ON CONFLICT on PostgreSQL, one multi-row upsert otherwise.
+    """
+    if not txns:
+        return BulkIngestResponse(ids=[], count=0, status="ingested")
+
+    try:
+        # Column views over the batch, built once
+        descriptors = [txn_data.raw_descriptor for txn_data in txns]
+        amounts = [txn_data.amount_cents for txn_data in txns]
+        mccs = [txn_data.mcc for txn_data in txns]
+        accounts = [txn_data.source_account for txn_data in txns]
+        directions = [txn_data.direction for txn_data in txns]
+
+        # Batch kernels: one vendors query, one tight hashing loop, one
+        # compiled-rules pass over the whole batch
+        vendor_map = await normalize_vendors(descriptors, db)
+        hash_ids = compute_hash_ids(txns)
+        actions = await apply_rules_batch(
+            descriptors, amounts, mccs, accounts, directions, db
+        )
+
+        rows = []
+        for txn_data, hash_id, action in zip(txns, hash_ids, actions):
+            row = _build_txn_dict(
+                txn_data, hash_id, vendor_map.get(txn_data.raw_descriptor)
+            )
+            # Deterministic rule hit: persist the categorization now and
+            # spare the later per-row /categorize round trip
+            if action is not None:
+                row["category"] = action.get("category")
+                row["subcategory"] = action.get("subcategory")
+                row["confidence_bp"] = 10_000
+            rows.append(row)
+
+        # Retried or double-submitted batches can carry the same hash_id
+        # twice; ON CONFLICT cannot update a row twice in one statement,
+        # so collapse duplicates here, keeping the last write
+        deduped = list({row["hash_id"]: row for row in rows}.values())
+        if len(deduped) < len(rows):
+            logger.info(
+                "Dropped %s duplicate rows from bulk batch",
+                len(rows) - len(deduped),
+            )
+
+        ids = await bulk_upsert_transactions(db, deduped)
+        await db.commit()
+
+        logger.info(
+            "Bulk ingested %s transactions", len(ids)
+        )
+
+        return BulkIngestResponse(ids=ids, count=len(ids), status="ingested")
+
+    except ValueError as e:
+        logger.error(f"Validation error during bulk ingestion: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        ) from e
+    except Exception as e:
+        logger.error(f"Error bulk ingesting transactions: {e}")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to ingest transactions"
+        ) from e
@@ -7,16 +7,32 @@ Rules are evaluated in priority order until a match is found.
 """
 import logging
 import re
+from functools import lru_cache
 from typing import Optional, Dict, Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from app.models import Transaction, Rule
+from app.models import Transaction
+from app.services.rules_cache import get_rule_matcher
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1024)
+def _compiled_regex(pattern: str) -> re.Pattern:
+    """
+    Compile a rule regex once and reuse it across evaluations.
+
+    The stdlib re module keeps its own (pattern, flags) cache, but it is
+    small and shared process-wide, so many distinct rule patterns thrash
+    it. This cache is scoped to rule evaluation and skips the pattern
+    parser on repeat calls. The hot apply_rules path already gets
+    precompiled patterns from services/rules_cache.py; this covers direct
+    evaluate_condition callers.
+    """
+    return re.compile(pattern, re.IGNORECASE)
+
+
 async def apply_rules(
     transaction: Transaction,
     db: AsyncSession
@@ -47,16 +63,13 @@ async def apply_rules(
         Exception: Database errors or malformed rule conditions
     """
     try:
-        # Load active rules ordered by priority
-        result = await db.execute(
-            select(Rule)
-            .where(Rule.active == True)
-            .order_by(Rule.priority.asc())
-        )
-        rules = result.scalars().all()
+        # The matcher comes from the TTL cache — no table load, no
+        # per-transaction condition parsing, and plain contains rules
+        # resolve via one automaton scan (see services/rules_cache.py)
+        matcher = await get_rule_matcher(db)
 
         logger.debug(
-            f"Evaluating {len(rules)} active rules for transaction {transaction.id}",
+            f"Evaluating {len(matcher.rules)} active rules for transaction {transaction.id}",
             extra={
                 "transaction_id": transaction.id,
                 "descriptor": transaction.raw_descriptor,
@@ -65,31 +78,17 @@ async def apply_rules(
             },
         )
 
-        # Evaluate each rule until match found
-        for rule in rules:
-            try:
-                if evaluate_condition(transaction, rule.condition):
-                    logger.info(
-                        f"Rule {rule.id} (priority {rule.priority}) matched transaction {transaction.id}",
-                        extra={
-                            "rule_id": rule.id,
-                            "transaction_id": transaction.id,
-                            "condition": rule.condition,
-                            "action": rule.action,
-                        },
-                    )
-                    return rule.action
-            except Exception as e:
-                logger.error(
-                    f"Error evaluating rule {rule.id}: {e}",
-                    extra={
-                        "rule_id": rule.id,
-                        "transaction_id": transaction.id,
-                        "error": str(e),
-                    },
-                    exc_info=True,
-                )
-                continue
+        rule = matcher.first_match(transaction)
+        if rule is not None:
+            logger.info(
+                f"Rule {rule.id} (priority {rule.priority}) matched transaction {transaction.id}",
+                extra={
+                    "rule_id": rule.id,
+                    "transaction_id": transaction.id,
+                    "action": rule.action,
+                },
+            )
+            return rule.action
 
         logger.debug(
             f"No matching rule found for transaction {transaction.id}",
@@ -145,16 +144,17 @@ def evaluate_condition(
         conditions_list = condition.get("or") or condition.get("any")
         return any(evaluate_condition(transaction, c) for c in conditions_list)
 
-    # Contains check (case-insensitive)
+    # Contains check (case-insensitive, against the per-instance cached
+    # lowered descriptor — see Transaction.raw_descriptor_lower)
     if "contains" in condition:
         search_term = condition["contains"].lower()
-        return search_term in transaction.raw_descriptor.lower()
+        return search_term in transaction.raw_descriptor_lower
 
-    # Regex check (case-insensitive)
+    # Regex check (case-insensitive, compiled once per pattern)
     if "regex" in condition:
         pattern = condition["regex"]
         try:
-            return bool(re.search(pattern, transaction.raw_descriptor, re.IGNORECASE))
+            return bool(_compiled_regex(pattern).search(transaction.raw_descriptor))
         except re.error as e:
             logger.error(
                 f"Invalid regex pattern: {pattern}",
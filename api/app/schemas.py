@@ -1,8 +1,7 @@
 """
 Pydantic schemas for request/response validation.
 """
-from datetime import date, datetime
-from decimal import Decimal
+from datetime import date as date_type, datetime, date
 from typing import Optional, List, Dict, Any
 
 from pydantic import BaseModel, Field, field_validator
@@ -73,7 +72,8 @@ class TxnOut(BaseModel):
     receipt_url: Optional[str] = None
     category: Optional[str] = None
     subcategory: Optional[str] = None
-    confidence: Optional[Decimal] = None
+    # Served from the Transaction.confidence property (basis points / 10000)
+    confidence: Optional[float] = None
     status: str
     notes: Optional[str] = None
 
@@ -119,6 +119,22 @@ class IngestResponse(BaseModel):
     }
 
 
+class BulkIngestResponse(BaseModel):
+    """
+    Response after bulk-ingesting a batch of transactions.
+    """
+
+    ids: List[int]
+    count: int
+    status: str
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {"ids": [123, 124, 125], "count": 3, "status": "ingested"}
+        }
+    }
+
+
 # ============================================================================
 # Categorization Schemas
 # ============================================================================
@@ -132,7 +148,7 @@ class CategorizeOut(BaseModel):
     id: int
     category: Optional[str] = None
     subcategory: Optional[str] = None
-    confidence: Optional[Decimal] = None
+    confidence: Optional[float] = None
     status: str
 
     model_config = {
@@ -256,7 +272,9 @@ class AlertOut(BaseModel):
     vendor: Optional[str] = None
     category: Optional[str] = None
     amount_cents: Optional[int] = None
-    date: Optional[date] = None
+    # Annotated via the date_type alias: the assignment on this line rebinds
+    # the name "date" in the class namespace before the annotation is stored.
+    date: Optional[date_type] = None
     message: str = Field(..., description="Human-readable alert message")
     severity: str = Field(default="info", description="Alert severity: info, warning, critical")
     metadata: Optional[Dict[str, Any]] = Field(None, description="Additional alert metadata")
@@ -7,13 +7,14 @@ This module provides various anomaly detection algorithms to identify:
 - Statistical outliers (z-score analysis)
 - Unusual spending patterns
 """
+import asyncio
 import logging
+import math
 from datetime import date, timedelta
-from typing import List, Dict
+from typing import List
 
-import numpy as np
-from sqlalchemy import select, func, and_
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Text, and_, cast, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.models import Transaction
 from app.schemas import AlertOut
@@ -21,9 +22,195 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Thresholds shared by the per-type detectors and the combined alerts query
+NEW_VENDOR_THRESHOLD_CENTS = 5000
+RECEIPT_THRESHOLD_CENTS = 2500
+MISSING_RECEIPT_LIMIT = 20
+PENDING_REVIEW_LIMIT = 50
+
+# Review threshold in basis points, matching transactions.confidence_bp
+_LOW_CONFIDENCE_BP = int(settings.LOW_CONFIDENCE * 10_000)
+
+
+def _alert_columns():
+    """Uniform labeled column list every alert branch selects, in union order."""
+    return (
+        Transaction.id.label("txn_id"),
+        Transaction.canonical_vendor.label("vendor"),
+        Transaction.raw_descriptor.label("raw_descriptor"),
+        Transaction.category.label("category"),
+        Transaction.amount_cents.label("amount_cents"),
+        Transaction.txn_date.label("txn_date"),
+        Transaction.confidence_bp.label("confidence_bp"),
+    )
+
+
+def _new_vendor_select(
+    start_date: date,
+    end_date: date,
+    threshold_cents: int = NEW_VENDOR_THRESHOLD_CENTS,
+):
+    """Branch select for new vendors whose first charge exceeds the threshold."""
+    # One ranking pass instead of a MIN() aggregate joined back onto the
+    # table: row_number() = 1 is each vendor's earliest transaction, and
+    # the partition walks the (canonical_vendor, txn_date) index (see
+    # migration 012) rather than re-scanning for the join
+    ranked = (
+        select(
+            *_alert_columns(),
+            Transaction.direction.label("direction"),
+            func.row_number()
+            .over(
+                partition_by=Transaction.canonical_vendor,
+                order_by=(Transaction.txn_date.asc(), Transaction.id.asc()),
+            )
+            .label("rn"),
+        )
+        .where(Transaction.canonical_vendor.isnot(None))
+        .subquery("vendor_first_txn")
+    )
+
+    return select(
+        literal("new_vendor_over_threshold").label("alert_type"),
+        literal("warning").label("severity"),
+        ranked.c.txn_id,
+        ranked.c.vendor,
+        ranked.c.raw_descriptor,
+        ranked.c.category,
+        ranked.c.amount_cents,
+        ranked.c.txn_date,
+        ranked.c.confidence_bp,
+    ).where(
+        and_(
+            ranked.c.rn == 1,
+            ranked.c.txn_date >= start_date,
+            ranked.c.txn_date <= end_date,
+            ranked.c.amount_cents >= threshold_cents,
+            ranked.c.direction == "debit",
+        )
+    )
+
+
+def _missing_receipt_select(
+    start_date: date,
+    end_date: date,
+    threshold_cents: int = RECEIPT_THRESHOLD_CENTS,
+):
+    """Branch select for high-value debits without a receipt (top 20 by amount)."""
+    candidates = (
+        select(*_alert_columns())
+        .where(
+            and_(
+                Transaction.txn_date >= start_date,
+                Transaction.txn_date <= end_date,
+                Transaction.receipt_url.is_(None),
+                Transaction.amount_cents >= threshold_cents,
+                Transaction.direction == "debit",
+            )
+        )
+        .order_by(Transaction.amount_cents.desc())
+        .limit(MISSING_RECEIPT_LIMIT)
+        .subquery("missing_receipts")
+    )
+
+    return select(
+        literal("missing_receipt").label("alert_type"),
+        literal("info").label("severity"),
+        *candidates.c,
+    )
+
+
+def _pending_review_select(
+    start_date: date,
+    end_date: date,
+    limit: int = PENDING_REVIEW_LIMIT,
+):
+    """Branch select for transactions parked in manual review (top 50 by amount)."""
+    # Bounded like the missing-receipt branch: a deep review queue should
+    # surface its largest amounts, not serialize every parked row
+    candidates = (
+        select(*_alert_columns())
+        .where(
+            and_(
+                Transaction.txn_date >= start_date,
+                Transaction.txn_date <= end_date,
+                Transaction.status == "review",
+            )
+        )
+        .order_by(Transaction.amount_cents.desc())
+        .limit(limit)
+        .subquery("pending_review")
+    )
+
+    return select(
+        literal("low_confidence").label("alert_type"),
+        literal("warning").label("severity"),
+        *candidates.c,
+    )
+
+
+def _row_to_alert(row) -> AlertOut:
+    """Build an AlertOut from one row of the combined alerts statement."""
+    name = row.vendor or row.raw_descriptor
+    amount = row.amount_cents / 100
+
+    if row.alert_type == "new_vendor_over_threshold":
+        return AlertOut.model_construct(
+            type="new_vendor_over_threshold",
+            vendor=row.vendor,
+            amount_cents=row.amount_cents,
+            date=row.txn_date,
+            message=f"New vendor '{row.vendor}' with charge of ${amount:.2f}",
+            severity=row.severity,
+            metadata={
+                "first_transaction": True,
+                "transaction_id": row.txn_id,
+            },
+        )
+
+    if row.alert_type == "missing_receipt":
+        return AlertOut.model_construct(
+            type="missing_receipt",
+            vendor=row.vendor,
+            category=row.category,
+            amount_cents=row.amount_cents,
+            date=row.txn_date,
+            message=f"Missing receipt for ${amount:.2f} at {name}",
+            severity=row.severity,
+            metadata={
+                "transaction_id": row.txn_id,
+                "needs_receipt": True,
+            },
+        )
+
+    # low_confidence (pending review)
+    reason = (
+        "low confidence"
+        if row.confidence_bp and row.confidence_bp < _LOW_CONFIDENCE_BP
+        else "high amount"
+    )
+    return AlertOut.model_construct(
+        type="low_confidence",
+        vendor=row.vendor,
+        category=row.category,
+        amount_cents=row.amount_cents,
+        date=row.txn_date,
+        message=f"Transaction pending review ({reason}): ${amount:.2f} at {name}",
+        severity=row.severity,
+        metadata={
+            "transaction_id": row.txn_id,
+            "confidence": row.confidence_bp / 10_000 if row.confidence_bp else None,
+            "reason": reason,
+        },
+    )
+
 
 async def detect_anomalies(
-    db: AsyncSession, lookback_days: int = 30
+    db: AsyncSession,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    lookback_days: int = 30,
+    severity: str | None = None,
 ) -> List[AlertOut]:
     """
     Detect anomalies in recent transactions.
@@ -36,9 +223,16 @@ async def detect_anomalies(
     5. Missing receipts on high-value transactions
     6. Low-confidence transactions pending review
 
+    The row-level alert types (1, 5 and 6) run as a single UNION ALL
+    statement with the severity filter applied in SQL, so the common case
+    is one round trip instead of three plus Python-side filtering.
+
     Args:
         db: Database session
-        lookback_days: Number of days to analyze (default: 30)
+        start_date: Start of the analysis window (default: lookback_days ago)
+        end_date: End of the analysis window (default: today)
+        lookback_days: Number of days to analyze when no explicit range given
+        severity: Only return alerts with this severity, if given
 
     Returns:
         List of anomaly alert dictionaries
@@ -48,8 +242,9 @@ async def detect_anomalies(
         >>> for alert in anomalies:
         ...     print(f"{alert.severity}: {alert.message}")
     """
-    cutoff_date = date.today() - timedelta(days=lookback_days)
-    end_date = date.today()
+    if end_date is None:
+        end_date = date.today()
+    cutoff_date = start_date or (end_date - timedelta(days=lookback_days))
 
     logger.info(
         f"Detecting anomalies for transactions since {cutoff_date}",
@@ -57,15 +252,76 @@ async def detect_anomalies(
     )
 
     try:
-        alerts = []
+        async def _combined_row_alerts(session: AsyncSession) -> List[AlertOut]:
+            # One statement for the three row-level alert types, severity
+            # filter pushed into SQL
+            combined = union_all(
+                _new_vendor_select(cutoff_date, end_date),
+                _missing_receipt_select(cutoff_date, end_date),
+                _pending_review_select(cutoff_date, end_date),
+            ).subquery("row_alerts")
+            stmt = select(combined)
+            if severity is not None:
+                stmt = stmt.where(combined.c.severity == severity)
+            # Stream off a server-side cursor: rows convert to alerts as
+            # they arrive instead of being buffered twice (same pattern
+            # as the summary aggregation in routers/reports)
+            result = await session.stream(
+                stmt.execution_options(yield_per=500)
+            )
+            return [_row_to_alert(row) async for row in result]
+
+        # The four alert sources are independent read-only queries, so
+        # they run concurrently and the wall time is the slowest query
+        # instead of the sum. An AsyncSession cannot serve concurrent
+        # statements, so each detector past the first gets its own
+        # session off the caller's engine.
+        session_factory = async_sessionmaker(
+            db.bind, class_=AsyncSession, expire_on_commit=False
+        )
+
+        async def _on_own_session(detector, *args) -> List[AlertOut]:
+            async with session_factory() as session:
+                # These sessions never write; telling PostgreSQL so
+                # (BEGIN READ ONLY) skips write-lock bookkeeping for the
+                # transaction. The option is dialect-specific, so it is
+                # not set on the SQLite test engine. The caller's
+                # request-scoped session is left untouched.
+                if session.bind.dialect.name == "postgresql":
+                    await session.connection(
+                        execution_options={"postgresql_readonly": True}
+                    )
+                return await detector(session, *args)
+
+        # return_exceptions keeps one failing detector from discarding
+        # the results of the others; failures are logged per detector
+        row_alerts, *extra_groups = await asyncio.gather(
+            _combined_row_alerts(db),
+            _on_own_session(detect_duplicates, cutoff_date, end_date),
+            _on_own_session(_detect_zscore_outliers, cutoff_date),
+            _on_own_session(_detect_unusual_spending, cutoff_date, end_date),
+            return_exceptions=True,
+        )
 
-        # Detect each anomaly type
-        alerts.extend(await detect_new_vendors(db, cutoff_date, end_date))
-        alerts.extend(await detect_duplicates(db, cutoff_date, end_date))
-        alerts.extend(await _detect_zscore_outliers(db, cutoff_date))
-        alerts.extend(await _detect_unusual_spending(db, cutoff_date))
-        alerts.extend(await detect_missing_receipts(db, cutoff_date, end_date))
-        alerts.extend(await detect_pending_review(db, cutoff_date, end_date))
+        detector_names = ("duplicates", "zscore_outliers", "unusual_spending")
+        if isinstance(row_alerts, BaseException):
+            logger.error(
+                f"Detector row_alerts failed: {row_alerts}",
+                exc_info=row_alerts,
+            )
+            alerts = []
+        else:
+            alerts = row_alerts
+
+        extra = []
+        for name, group in zip(detector_names, extra_groups):
+            if isinstance(group, BaseException):
+                logger.error(f"Detector {name} failed: {group}", exc_info=group)
+                continue
+            extra.extend(group)
+        if severity is not None:
+            extra = [a for a in extra if a.severity == severity]
+        alerts.extend(extra)
 
         logger.info(
             f"Detected {len(alerts)} anomalies",
@@ -87,7 +343,7 @@ async def detect_new_vendors(
     db: AsyncSession,
     start_date: date,
     end_date: date,
-    threshold_cents: int = 5000
+    threshold_cents: int = NEW_VENDOR_THRESHOLD_CENTS
 ) -> List[AlertOut]:
     """
     Detect new vendors with charges above threshold.
@@ -101,60 +357,17 @@ async def detect_new_vendors(
     Returns:
         List of new vendor alerts
     """
-    alerts = []
-
-    # Find vendors with first transaction in date range
-    subq = (
-        select(
-            Transaction.canonical_vendor,
-            func.min(Transaction.txn_date).label("first_date")
-        )
-        .where(Transaction.canonical_vendor.isnot(None))
-        .group_by(Transaction.canonical_vendor)
-        .subquery()
-    )
-
     result = await db.execute(
-        select(Transaction, subq.c.first_date)
-        .join(
-            subq,
-            and_(
-                Transaction.canonical_vendor == subq.c.canonical_vendor,
-                Transaction.txn_date == subq.c.first_date
-            )
-        )
-        .where(
-            and_(
-                subq.c.first_date >= start_date,
-                subq.c.first_date <= end_date,
-                Transaction.amount_cents >= threshold_cents,
-                Transaction.direction == "debit"
-            )
-        )
+        _new_vendor_select(start_date, end_date, threshold_cents)
     )
-
-    for txn, first_date in result.all():
-        alerts.append(AlertOut(
-            type="new_vendor_over_threshold",
-            vendor=txn.canonical_vendor,
-            amount_cents=txn.amount_cents,
-            date=txn.txn_date,
-            message=f"New vendor '{txn.canonical_vendor}' with charge of ${txn.amount_cents / 100:.2f}",
-            severity="warning",
-            metadata={
-                "first_transaction": True,
-                "transaction_id": txn.id
-            }
-        ))
-
-    return alerts
+    return [_row_to_alert(row) for row in result]
 
 
 async def detect_missing_receipts(
     db: AsyncSession,
     start_date: date,
     end_date: date,
-    threshold_cents: int = 2500
+    threshold_cents: int = RECEIPT_THRESHOLD_CENTS
 ) -> List[AlertOut]:
     """
     Detect high-value transactions without receipts.
@@ -168,39 +381,10 @@ async def detect_missing_receipts(
     Returns:
         List of missing receipt alerts
     """
-    alerts = []
-
     result = await db.execute(
-        select(Transaction)
-        .where(
-            and_(
-                Transaction.txn_date >= start_date,
-                Transaction.txn_date <= end_date,
-                Transaction.receipt_url.is_(None),
-                Transaction.amount_cents >= threshold_cents,
-                Transaction.direction == "debit"
-            )
-        )
-        .order_by(Transaction.amount_cents.desc())
-        .limit(20)
+        _missing_receipt_select(start_date, end_date, threshold_cents)
     )
-
-    for txn in result.scalars().all():
-        alerts.append(AlertOut(
-            type="missing_receipt",
-            vendor=txn.canonical_vendor,
-            category=txn.category,
-            amount_cents=txn.amount_cents,
-            date=txn.txn_date,
-            message=f"Missing receipt for ${txn.amount_cents / 100:.2f} at {txn.canonical_vendor or txn.raw_descriptor}",
-            severity="info",
-            metadata={
-                "transaction_id": txn.id,
-                "needs_receipt": True
-            }
-        ))
-
-    return alerts
+    return [_row_to_alert(row) for row in result]
 
 
 async def detect_pending_review(
@@ -217,41 +401,11 @@ async def detect_pending_review(
         end_date: End date
 
     Returns:
-        List of review alerts
+        List of review alerts, largest amounts first (capped at
+        PENDING_REVIEW_LIMIT)
     """
-    alerts = []
-
-    result = await db.execute(
-        select(Transaction)
-        .where(
-            and_(
-                Transaction.txn_date >= start_date,
-                Transaction.txn_date <= end_date,
-                Transaction.status == "review"
-            )
-        )
-        .order_by(Transaction.txn_date.desc())
-    )
-
-    for txn in result.scalars().all():
-        reason = "low confidence" if txn.confidence and txn.confidence < settings.LOW_CONFIDENCE else "high amount"
-
-        alerts.append(AlertOut(
-            type="low_confidence",
-            vendor=txn.canonical_vendor,
-            category=txn.category,
-            amount_cents=txn.amount_cents,
-            date=txn.txn_date,
-            message=f"Transaction pending review ({reason}): ${txn.amount_cents / 100:.2f} at {txn.canonical_vendor or txn.raw_descriptor}",
-            severity="warning",
-            metadata={
-                "transaction_id": txn.id,
-                "confidence": float(txn.confidence) if txn.confidence else None,
-                "reason": reason
-            }
-        ))
-
-    return alerts
+    result = await db.execute(_pending_review_select(start_date, end_date))
+    return [_row_to_alert(row) for row in result]
 
 
 async def detect_duplicates(
@@ -270,7 +424,7 @@ async def detect_duplicates(
         time_window_hours: Time window for duplicate detection
 
     Returns:
-        List of duplicate alerts
+        List of duplicate alerts, one per duplicate group
 
     Logic:
         - Same vendor
@@ -278,11 +432,18 @@ async def detect_duplicates(
         - Within time window
         - Different hash_id
     """
-    alerts = []
-
-    # Find all transactions in range
-    result = await db.execute(
-        select(Transaction)
+    # GROUP BY pushes the pairwise matching into the database: only the
+    # duplicate groups cross the wire instead of every transaction in the
+    # window. Ids are aggregated with aggregate_strings (string_agg /
+    # group_concat) since SQLite has no array_agg; the HAVING clause on
+    # distinct hash_id keeps the old different-hash requirement.
+    stmt = (
+        select(
+            Transaction.canonical_vendor,
+            Transaction.amount_cents,
+            Transaction.txn_date,
+            func.aggregate_strings(cast(Transaction.id, Text), ",").label("ids"),
+        )
         .where(
             and_(
                 Transaction.txn_date >= start_date,
@@ -290,35 +451,30 @@ async def detect_duplicates(
                 Transaction.canonical_vendor.isnot(None)
             )
         )
-        .order_by(Transaction.txn_date, Transaction.canonical_vendor)
+        .group_by(
+            Transaction.canonical_vendor,
+            Transaction.amount_cents,
+            Transaction.txn_date,
+        )
+        .having(func.count(func.distinct(Transaction.hash_id)) > 1)
     )
-
-    transactions = result.scalars().all()
-
-    # Simple duplicate detection
-    seen = {}
-    for txn in transactions:
-        key = (txn.canonical_vendor, txn.amount_cents, txn.txn_date)
-
-        if key in seen:
-            other = seen[key]
-            if other.hash_id != txn.hash_id:
-                alerts.append(AlertOut(
-                    type="duplicate_warning",
-                    vendor=txn.canonical_vendor,
-                    amount_cents=txn.amount_cents,
-                    date=txn.txn_date,
-                    message=f"Possible duplicate: ${txn.amount_cents / 100:.2f} at {txn.canonical_vendor} on {txn.txn_date}",
-                    severity="info",
-                    metadata={
-                        "transaction_ids": [txn.id, other.id],
-                        "same_day": True
-                    }
-                ))
-        else:
-            seen[key] = txn
-
-    return alerts
+    result = await db.execute(stmt)
+
+    return [
+        AlertOut.model_construct(
+            type="duplicate_warning",
+            vendor=row.canonical_vendor,
+            amount_cents=row.amount_cents,
+            date=row.txn_date,
+            message=f"Possible duplicate: ${row.amount_cents / 100:.2f} at {row.canonical_vendor} on {row.txn_date}",
+            severity="info",
+            metadata={
+                "transaction_ids": [int(i) for i in row.ids.split(",")],
+                "same_day": True
+            }
+        )
+        for row in result
+    ]
 
 
 async def _detect_zscore_outliers(
@@ -335,89 +491,92 @@ async def _detect_zscore_outliers(
     Returns:
         List of anomaly alerts
     """
+    # Exceptions propagate: detect_anomalies logs per-detector failures
+    # from the gather, and standalone callers should see real errors
+    # rather than a silent empty list.
     alerts = []
 
-    try:
-        # Get all categories
-        stmt = (
-            select(Transaction.category)
-            .where(
-                and_(
-                    Transaction.txn_date >= cutoff_date,
-                    Transaction.category.isnot(None),
-                )
-            )
-            .distinct()
+    # One statement instead of a query per category: window functions
+    # compute each category's mean and variance in-engine, and the
+    # outer filter keeps only outlier rows, so everything but the
+    # anomalies stays on the database side. Variance comes from the
+    # avg(x^2) - avg(x)^2 identity (population, matching the previous
+    # NumPy std) because SQLite has no stddev aggregate; the outlier
+    # test compares squared deviations so no sqrt is needed in SQL.
+    amount = Transaction.amount_cents
+    windowed = (
+        select(
+            Transaction.id,
+            Transaction.canonical_vendor,
+            Transaction.category,
+            amount.label("amount_cents"),
+            Transaction.txn_date,
+            func.avg(amount).over(partition_by=Transaction.category).label("mu"),
+            func.avg(amount * amount)
+            .over(partition_by=Transaction.category)
+            .label("musq"),
+            func.count().over(partition_by=Transaction.category).label("n"),
         )
-        result = await db.execute(stmt)
-        categories = [row[0] for row in result]
-
-        # Analyze each category
-        for category in categories:
-            # Get all amounts for this category
-            stmt = (
-                select(Transaction)
-                .where(
-                    and_(
-                        Transaction.category == category,
-                        Transaction.txn_date >= cutoff_date,
-                    )
-                )
-                .order_by(Transaction.amount_cents.desc())
+        .where(
+            and_(
+                Transaction.txn_date >= cutoff_date,
+                Transaction.category.isnot(None),
             )
-            result = await db.execute(stmt)
-            txns = result.scalars().all()
-
-            if len(txns) < 5:  # Need minimum sample size
-                continue
-
-            amounts = np.array([t.amount_cents for t in txns])
-            mean = np.mean(amounts)
-            std = np.std(amounts)
-
-            if std == 0:  # All amounts are the same
-                continue
-
-            # Find outliers
-            for txn in txns:
-                z_score = abs((txn.amount_cents - mean) / std)
-                if z_score > z_threshold:
-                    severity = "high" if z_score > 3.0 else "medium"
-                    alerts.append(
-                        AlertOut(
-                            type="zscore_outlier",
-                            vendor=txn.canonical_vendor,
-                            category=category,
-                            amount_cents=txn.amount_cents,
-                            date=txn.txn_date,
-                            message=f"Unusual ${txn.amount_cents / 100:.2f} transaction in {category} (z-score: {z_score:.2f})",
-                            severity=severity,
-                            metadata={
-                                "z_score": round(z_score, 2),
-                                "category_mean": round(float(mean), 2),
-                                "category_std": round(float(std), 2),
-                                "transaction_id": txn.id,
-                            },
-                        )
-                    )
-
-        logger.debug(
-            f"Found {len(alerts)} z-score outlier anomalies",
-            extra={"count": len(alerts)},
         )
+        .subquery("zscore_windows")
+    )
+    variance = windowed.c.musq - windowed.c.mu * windowed.c.mu
+    deviation = windowed.c.amount_cents - windowed.c.mu
+    stmt = select(
+        windowed.c.id,
+        windowed.c.canonical_vendor,
+        windowed.c.category,
+        windowed.c.amount_cents,
+        windowed.c.txn_date,
+        windowed.c.mu,
+        variance.label("variance"),
+    ).where(
+        windowed.c.n >= 5,  # Need minimum sample size
+        variance > 0,  # Skip categories where all amounts are the same
+        deviation * deviation > (z_threshold * z_threshold) * variance,
+    )
 
-    except Exception as e:
-        logger.error(
-            f"Error detecting z-score anomalies: {e}",
-            extra={"error": str(e)},
-            exc_info=True,
+    result = await db.execute(stmt)
+    for row in result:
+        std = math.sqrt(row.variance)
+        z_score = abs((row.amount_cents - row.mu) / std)
+        severity = "high" if z_score > 3.0 else "medium"
+        alerts.append(
+            AlertOut.model_construct(
+                type="zscore_outlier",
+                vendor=row.canonical_vendor,
+                category=row.category,
+                amount_cents=row.amount_cents,
+                date=row.txn_date,
+                message=f"Unusual ${row.amount_cents / 100:.2f} transaction in {row.category} (z-score: {z_score:.2f})",
+                severity=severity,
+                metadata={
+                    "z_score": round(z_score, 2),
+                    "category_mean": round(float(row.mu), 2),
+                    "category_std": round(std, 2),
+                    "transaction_id": row.id,
+                },
+            )
         )
 
+    logger.debug(
+        f"Found {len(alerts)} z-score outlier anomalies",
+        extra={"count": len(alerts)},
+    )
+
     return alerts
 
 
 async def _detect_unusual_spending(
-    db: AsyncSession, cutoff_date: date, multiplier: float = 3.0
+    db: AsyncSession,
+    cutoff_date: date,
+    end_date: date | None = None,
+    multiplier: float = 3.0,
 ) -> List[AlertOut]:
     """
     Detect unusual spending patterns (category spending >3x average).
@@ -425,102 +584,80 @@ async def _detect_unusual_spending(
     Args:
         db: Database session
         cutoff_date: Only consider transactions after this date
+        end_date: End of the recent window (default: today); the caller
+            passes its already-computed window end so both bounds are
+            fixed once per detect_anomalies call
         multiplier: Spending multiplier threshold (default: 3.0)
 
     Returns:
         List of anomaly alerts
     """
+    # Exceptions propagate; detect_anomalies handles them per detector
     alerts = []
 
-    try:
-        # Get spending by category for recent period
-        recent_start = cutoff_date
-        recent_end = date.today()
-        period_days = (recent_end - recent_start).days
-
-        # Get historical baseline (2x the lookback period)
-        historical_start = recent_start - timedelta(days=period_days * 2)
-        historical_end = recent_start
-
-        # Calculate recent spending per category
-        recent_stmt = (
-            select(
-                Transaction.category,
-                func.sum(Transaction.amount_cents).label("total"),
-            )
-            .where(
-                and_(
-                    Transaction.txn_date >= recent_start,
-                    Transaction.txn_date <= recent_end,
-                    Transaction.category.isnot(None),
-                    Transaction.direction == "debit",  # Only count expenses
-                )
+    # Get spending by category for recent period
+    recent_start = cutoff_date
+    recent_end = end_date or date.today()
+    period_days = (recent_end - recent_start).days
+
+    # Get historical baseline (2x the lookback period)
+    historical_start = recent_start - timedelta(days=period_days * 2)
+    historical_end = recent_start
+
+    # Both windows aggregate in one statement: FILTER splits the sums
+    # at recent_start, so the transaction index is scanned once and
+    # the Python-side dict join disappears. The HAVING clause returns
+    # only the categories that breach the multiplier.
+    recent_total = func.sum(Transaction.amount_cents).filter(
+        Transaction.txn_date >= recent_start
+    ).label("recent")
+    historical_total = func.sum(Transaction.amount_cents).filter(
+        Transaction.txn_date < historical_end
+    ).label("historical")
+    stmt = (
+        select(Transaction.category, recent_total, historical_total)
+        .where(
+            and_(
+                Transaction.txn_date >= historical_start,
+                Transaction.txn_date <= recent_end,
+                Transaction.category.isnot(None),
+                Transaction.direction == "debit",  # Only count expenses
             )
-            .group_by(Transaction.category)
         )
-        recent_result = await db.execute(recent_stmt)
-        recent_spending = {row[0]: row[1] for row in recent_result}
-
-        # Calculate historical average per category
-        historical_stmt = (
-            select(
-                Transaction.category,
-                func.sum(Transaction.amount_cents).label("total"),
-            )
-            .where(
-                and_(
-                    Transaction.txn_date >= historical_start,
-                    Transaction.txn_date < historical_end,
-                    Transaction.category.isnot(None),
-                    Transaction.direction == "debit",
-                )
+        .group_by(Transaction.category)
+        .having(
+            and_(
+                historical_total > 0,
+                recent_total > multiplier * historical_total,
             )
-            .group_by(Transaction.category)
         )
-        historical_result = await db.execute(historical_stmt)
-        historical_spending = {row[0]: row[1] for row in historical_result}
-
-        # Compare recent vs historical
-        for category, recent_amount in recent_spending.items():
-            if category not in historical_spending:
-                continue
-
-            historical_amount = historical_spending[category]
-            if historical_amount == 0:
-                continue
-
-            ratio = recent_amount / historical_amount
-
-            if ratio > multiplier:
-                severity = "high" if ratio > 5.0 else "medium"
-                alerts.append(
-                    AlertOut(
-                        type="unusual_category_spending",
-                        category=category,
-                        amount_cents=recent_amount,
-                        date=recent_end,
-                        message=f"{category} spending is {ratio:.1f}x higher than average",
-                        severity=severity,
-                        metadata={
-                            "recent_amount_cents": recent_amount,
-                            "historical_amount_cents": historical_amount,
-                            "ratio": round(ratio, 2),
-                            "recent_period_days": period_days,
-                            "historical_period_days": period_days * 2,
-                        },
-                    )
-                )
-
-        logger.debug(
-            f"Found {len(alerts)} unusual spending anomalies",
-            extra={"count": len(alerts)},
+    )
+    result = await db.execute(stmt)
+
+    for row in result:
+        ratio = row.recent / row.historical
+        severity = "high" if ratio > 5.0 else "medium"
+        alerts.append(
+            AlertOut.model_construct(
+                type="unusual_category_spending",
+                category=row.category,
+                amount_cents=row.recent,
+                date=recent_end,
+                message=f"{row.category} spending is {ratio:.1f}x higher than average",
+                severity=severity,
+                metadata={
+                    "recent_amount_cents": row.recent,
+                    "historical_amount_cents": row.historical,
+                    "ratio": round(ratio, 2),
+                    "recent_period_days": period_days,
+                    "historical_period_days": period_days * 2,
+                },
+            )
         )
 
-    except Exception as e:
-        logger.error(
-            f"Error detecting unusual spending anomalies: {e}",
-            extra={"error": str(e)},
-            exc_info=True,
-        )
+    logger.debug(
+        f"Found {len(alerts)} unusual spending anomalies",
+        extra={"count": len(alerts)},
+    )
 
     return alerts
@@ -0,0 +1,86 @@
+"""
+Aho-Corasick multi-pattern matcher for "contains" rule literals.
+
+Evaluating N substring rules against a descriptor costs N separate
+scans. An Aho-Corasick automaton built once over all active needles
+finds every occurring needle in a single pass over the descriptor, so
+rule-heavy workloads stay O(len(descriptor)) per transaction instead of
+O(rules * len(descriptor)). The pyahocorasick C extension is not a
+dependency of this tree, so the automaton is the textbook dict-trie
+construction with BFS failure links, built in pure Python at rule-load
+time (construction cost is off the hot path — see services/rules_cache).
+"""
+from collections import deque
+from typing import Iterable, List, Set
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring matcher over a fixed set of needles.
+
+    Needles are matched as given; callers wanting case-insensitive
+    matching lowercase both the needles and the searched text.
+    """
+
+    __slots__ = ("_goto", "_fail", "_output")
+
+    def __init__(self, needles: Iterable[str]):
+        # Trie: state index -> {char: next state}; state 0 is the root.
+        goto: List[dict] = [{}]
+        output: List[Set[str]] = [set()]
+
+        for needle in needles:
+            if not needle:
+                continue
+            state = 0
+            for char in needle:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    goto.append({})
+                    output.append(set())
+                    next_state = len(goto) - 1
+                    goto[state][char] = next_state
+                state = next_state
+            output[state].add(needle)
+
+        # Failure links via BFS; each state's output inherits its failure
+        # state's output so nested needles ("STAR" inside "STARBUCKS")
+        # are all reported.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                candidate = goto[fallback].get(char, 0)
+                fail[next_state] = candidate if candidate != next_state else 0
+                output[next_state] |= output[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+
+    def find_all(self, text: str) -> Set[str]:
+        """
+        Return the set of needles occurring anywhere in text.
+
+        One pass over text regardless of how many needles the automaton
+        holds; overlapping and nested occurrences are all found.
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        found: Set[str] = set()
+
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+
+        return found
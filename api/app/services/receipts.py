@@ -51,16 +51,20 @@ async def find_receipt(
     # TODO: Implement Google Drive API integration
     # This is a placeholder that will be implemented when integrating with n8n
 
-    logger.debug(
-        f"Receipt search requested for transaction {txn.id}",
-        extra={
-            "transaction_id": txn.id,
-            "txn_date": txn.txn_date,
-            "amount_cents": txn.amount_cents,
-            "vendor": txn.canonical_vendor,
-            "drive_folder": drive_folder_id,
-        },
-    )
+    # Gated so the extra dict is not built per call when the level is off
+    # (this runs once per transaction in a batch matching job)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Receipt search requested for transaction %s",
+            txn.id,
+            extra={
+                "transaction_id": txn.id,
+                "txn_date": txn.txn_date,
+                "amount_cents": txn.amount_cents,
+                "vendor": txn.canonical_vendor,
+                "drive_folder": drive_folder_id,
+            },
+        )
 
     # Calculate search parameters
     date_start = txn.txn_date - timedelta(days=3)
@@ -68,15 +72,19 @@ async def find_receipt(
     amount_min = int(txn.amount_cents * 0.9)  # -10%
     amount_max = int(txn.amount_cents * 1.1)  # +10%
 
-    logger.info(
-        f"Receipt search criteria: date [{date_start}, {date_end}], "
-        f"amount [{amount_min}, {amount_max}] cents",
-        extra={
-            "transaction_id": txn.id,
-            "date_range": [str(date_start), str(date_end)],
-            "amount_range": [amount_min, amount_max],
-        },
-    )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Receipt search criteria: date [%s, %s], amount [%d, %d] cents",
+            date_start,
+            date_end,
+            amount_min,
+            amount_max,
+            extra={
+                "transaction_id": txn.id,
+                "date_range": [str(date_start), str(date_end)],
+                "amount_range": [amount_min, amount_max],
+            },
+        )
 
     # TODO: Implementation steps:
     # 1. Authenticate with Google Drive API (service account or OAuth)
@@ -139,7 +147,8 @@ async def extract_receipt_metadata(receipt_url: str) -> Optional[dict]:
     """
     # TODO: Implement receipt parsing
     logger.debug(
-        f"Receipt metadata extraction requested for {receipt_url}",
+        "Receipt metadata extraction requested for %s",
+        receipt_url,
         extra={"receipt_url": receipt_url},
     )
 
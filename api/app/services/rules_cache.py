@@ -0,0 +1,336 @@
+"""
+Compiled rule cache for the categorization rule engine.
+
+Every categorize call used to reload the rules table and re-interpret the
+JSONB condition dicts per transaction. This module loads active rules once
+per TTL window and compiles each condition into a plain Python predicate —
+regexes precompiled, substring needles pre-lowercased, MCC lists turned
+into frozensets — so the hot path is one closure call per rule instead of
+a dict walk.
+"""
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Rule, Transaction
+from app.services.contains_matcher import AhoCorasick
+
+logger = logging.getLogger(__name__)
+
+# Rules change rarely (manual edits, seeds), so a short TTL keeps the
+# cache fresh without a round trip per categorization
+RULES_CACHE_TTL_SECONDS = 30.0
+
+# Below this many distinct "contains" needles the automaton buys nothing
+# over the per-rule C-level substring checks, so it is only built past
+# the threshold (same gating idea as COPY_MIN_ROWS in app.db_bulk)
+AC_MIN_NEEDLES = 8
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """An active rule with its condition compiled to a predicate."""
+
+    id: int
+    priority: int
+    action: Dict[str, Any]
+    predicate: Callable[[Transaction], bool]
+    # Set only for plain {"contains": X} conditions — the literal needle
+    # (lowercased) the Aho-Corasick automaton matches in one pass
+    contains_needle: Optional[str] = None
+    # True when the matcher decides this rule from its prefilter buckets
+    # (automaton / mcc / account) without calling the predicate
+    bucketed: bool = False
+    # Exposed for plain single-key conditions so the batch kernel can
+    # evaluate them as NumPy masks over whole columns (see rules_kernel)
+    amount_range: Optional[Tuple[int, int]] = None
+    direction: Optional[str] = None
+
+
+@dataclass
+class RuleMatcher:
+    """
+    The active rule set with its shared matching machinery.
+
+    first_match is the one evaluation loop every caller (single
+    categorize, batch kernel, bulk route) goes through. Single-key rules
+    are decided by prefilter lookups — plain-contains rules from one
+    Aho-Corasick scan of the descriptor (when enough needles exist),
+    mcc/mcc_in and account rules from dict buckets — so the priority walk
+    does a set-membership check for them instead of a predicate call.
+    Only rules with compound or open-ended conditions (regex,
+    amount_range, direction, and/or) still evaluate per transaction.
+    """
+
+    rules: List[CompiledRule]
+    automaton: Optional[AhoCorasick] = None
+    # Prefilter buckets: lookup key -> ids of rules that match on it
+    needle_rules: Dict[str, Tuple[int, ...]] = field(default_factory=dict)
+    mcc_rules: Dict[str, Tuple[int, ...]] = field(default_factory=dict)
+    account_rules: Dict[str, Tuple[int, ...]] = field(default_factory=dict)
+
+    def first_match(
+        self,
+        txn,
+        known: Optional[Dict[int, bool]] = None,
+    ) -> Optional[CompiledRule]:
+        """
+        Return the highest-priority matching rule, or None.
+
+        Args:
+            txn: Transaction (or Row/namedtuple with the same fields,
+                including a precomputed raw_descriptor_lower)
+            known: Optional precomputed outcomes (rule id -> matched) the
+                batch kernel derives from vectorized masks; rules present
+                here skip their predicate call
+        """
+        # Resolve every bucketed rule up front; the walk below then only
+        # checks membership for them
+        matched_ids: Set[int] = set()
+        if self.automaton is not None:
+            for needle in self.automaton.find_all(txn.raw_descriptor_lower):
+                matched_ids.update(self.needle_rules[needle])
+        if self.mcc_rules and txn.mcc:
+            ids = self.mcc_rules.get(txn.mcc)
+            if ids:
+                matched_ids.update(ids)
+        if self.account_rules:
+            ids = self.account_rules.get(txn.source_account)
+            if ids:
+                matched_ids.update(ids)
+
+        for rule in self.rules:
+            if rule.bucketed:
+                if rule.id in matched_ids:
+                    return rule
+                continue
+            if known is not None:
+                outcome = known.get(rule.id)
+                if outcome is not None:
+                    if outcome:
+                        return rule
+                    continue
+            try:
+                if rule.predicate(txn):
+                    return rule
+            except Exception as e:
+                logger.error(
+                    f"Error evaluating rule {rule.id}: {e}",
+                    extra={"rule_id": rule.id, "error": str(e)},
+                )
+                continue
+        return None
+
+
+@dataclass
+class _CachedRules:
+    matcher: RuleMatcher
+    loaded_at: float
+
+
+_cache: Optional[_CachedRules] = None
+
+
+def clear_rules_cache() -> None:
+    """Drop the compiled rule cache (used by tests and rule updates)."""
+    global _cache
+    _cache = None
+
+
+async def get_rule_matcher(db: AsyncSession) -> RuleMatcher:
+    """
+    Return the active rule set with its matching machinery.
+
+    Loads from the database at most once per RULES_CACHE_TTL_SECONDS;
+    condition compilation and automaton construction happen on the same
+    cadence, never per transaction.
+
+    Args:
+        db: Database session
+
+    Returns:
+        RuleMatcher over the active rules in ascending priority order
+    """
+    global _cache
+
+    now = time.monotonic()
+    if _cache is not None and now - _cache.loaded_at < RULES_CACHE_TTL_SECONDS:
+        return _cache.matcher
+
+    result = await db.execute(
+        select(Rule)
+        .where(Rule.active == True)  # noqa: E712
+        .order_by(Rule.priority.asc())
+    )
+    rules = result.scalars().all()
+
+    # The automaton is only worth building past the needle threshold, and
+    # the bucketed flag depends on that decision — so gather needles first
+    all_needles = {
+        rule.condition["contains"].lower()
+        for rule in rules
+        if len(rule.condition) == 1 and "contains" in rule.condition
+    }
+    use_automaton = len(all_needles) >= AC_MIN_NEEDLES
+
+    compiled = []
+    needle_rules: Dict[str, List[int]] = {}
+    mcc_rules: Dict[str, List[int]] = {}
+    account_rules: Dict[str, List[int]] = {}
+    for rule in rules:
+        try:
+            condition = rule.condition
+            needle = None
+            bucketed = False
+            amount_range = None
+            direction = None
+            if len(condition) == 1:
+                # Single-key conditions feed the prefilter buckets; the
+                # matcher then decides them without a predicate call
+                if "contains" in condition and use_automaton:
+                    needle = condition["contains"].lower()
+                    needle_rules.setdefault(needle, []).append(rule.id)
+                    bucketed = True
+                elif "mcc" in condition:
+                    mcc_rules.setdefault(condition["mcc"], []).append(rule.id)
+                    bucketed = True
+                elif "mcc_in" in condition:
+                    for mcc in condition["mcc_in"]:
+                        mcc_rules.setdefault(mcc, []).append(rule.id)
+                    bucketed = True
+                elif "account" in condition:
+                    account_rules.setdefault(
+                        condition["account"], []
+                    ).append(rule.id)
+                    bucketed = True
+                elif "amount_range" in condition:
+                    lo, hi = condition["amount_range"]
+                    amount_range = (lo, hi)
+                elif "direction" in condition:
+                    direction = condition["direction"]
+            compiled.append(
+                CompiledRule(
+                    id=rule.id,
+                    priority=rule.priority,
+                    action=rule.action,
+                    predicate=compile_condition(condition),
+                    contains_needle=needle,
+                    bucketed=bucketed,
+                    amount_range=amount_range,
+                    direction=direction,
+                )
+            )
+        except Exception as e:
+            logger.error(
+                f"Skipping rule {rule.id}: condition failed to compile: {e}",
+                extra={"rule_id": rule.id, "condition": rule.condition},
+                exc_info=True,
+            )
+
+    _cache = _CachedRules(
+        matcher=RuleMatcher(
+            rules=compiled,
+            automaton=AhoCorasick(all_needles) if use_automaton else None,
+            needle_rules={k: tuple(v) for k, v in needle_rules.items()},
+            mcc_rules={k: tuple(v) for k, v in mcc_rules.items()},
+            account_rules={k: tuple(v) for k, v in account_rules.items()},
+        ),
+        loaded_at=now,
+    )
+    logger.debug(
+        "Compiled %s active rules into the cache (%s contains needles, "
+        "%s mcc buckets, %s account buckets)",
+        len(compiled), len(all_needles), len(mcc_rules), len(account_rules),
+    )
+    return _cache.matcher
+
+
+async def get_compiled_rules(db: AsyncSession) -> List[CompiledRule]:
+    """
+    Return the active rules compiled to predicates, in priority order.
+
+    Thin wrapper over get_rule_matcher for callers that only need the
+    rule list.
+    """
+    matcher = await get_rule_matcher(db)
+    return matcher.rules
+
+
+def compile_condition(
+    condition: Dict[str, Any]
+) -> Callable[[Transaction], bool]:
+    """
+    Compile a JSONB condition dict into a predicate closure.
+
+    Supports the same condition grammar as the rule engine: contains,
+    regex, mcc, mcc_in, amount_range, account, direction, and the
+    and/or/all/any logical operators.
+
+    Args:
+        condition: Condition dict from rules.condition
+
+    Returns:
+        Callable evaluating a Transaction to a bool
+
+    Raises:
+        ValueError: If a regex pattern is invalid
+    """
+    if "and" in condition or "all" in condition:
+        subs = [
+            compile_condition(c)
+            for c in (condition.get("and") or condition.get("all"))
+        ]
+        return lambda txn: all(p(txn) for p in subs)
+
+    if "or" in condition or "any" in condition:
+        subs = [
+            compile_condition(c)
+            for c in (condition.get("or") or condition.get("any"))
+        ]
+        return lambda txn: any(p(txn) for p in subs)
+
+    if "contains" in condition:
+        needle = condition["contains"].lower()
+        # raw_descriptor_lower is cached per instance (see models), so M
+        # contains rules share one lowercase walk instead of doing M
+        return lambda txn: needle in txn.raw_descriptor_lower
+
+    if "regex" in condition:
+        try:
+            pattern = re.compile(condition["regex"], re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(
+                f"Invalid regex pattern: {condition['regex']}"
+            ) from e
+        return lambda txn: bool(pattern.search(txn.raw_descriptor))
+
+    if "mcc" in condition:
+        mcc = condition["mcc"]
+        return lambda txn: txn.mcc == mcc if txn.mcc else False
+
+    if "mcc_in" in condition:
+        mccs = frozenset(condition["mcc_in"])
+        return lambda txn: txn.mcc in mccs if txn.mcc else False
+
+    if "amount_range" in condition:
+        min_amt, max_amt = condition["amount_range"]
+        return lambda txn: min_amt <= txn.amount_cents <= max_amt
+
+    if "account" in condition:
+        account = condition["account"]
+        return lambda txn: txn.source_account == account
+
+    if "direction" in condition:
+        direction = condition["direction"]
+        return lambda txn: txn.direction == direction
+
+    logger.warning(
+        f"Unknown condition type: {list(condition.keys())}",
+        extra={"condition": condition},
+    )
+    return lambda txn: False
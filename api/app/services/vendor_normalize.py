@@ -6,30 +6,71 @@ raw transaction descriptors against known canonical vendor names and aliases.
 """
 import logging
 import re
+import time
+from dataclasses import dataclass
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Vendor
+from app.services.contains_matcher import AhoCorasick
 
 logger = logging.getLogger(__name__)
 
-# Common descriptor patterns to clean
-CLEANUP_PATTERNS = [
-    (r"TST\*", ""),  # Remove "TST*" prefix common in card processors
-    (r"SQ\s*\*", ""),  # Remove "SQ *" prefix from Square transactions
-    (r"PP\*", ""),  # Remove "PP*" prefix from PayPal
-    (r"SP\s*\*", ""),  # Remove "SP*" prefix
-    (r"\s*#\d+", ""),  # Remove store numbers like " #1234"
-    (r"\s+STORE\s+\d+", ""),  # Remove "STORE 123" patterns
-    (r"\s+\d{3,5}\s*$", ""),  # Remove trailing 3-5 digit numbers
-    (r"\s{2,}", " "),  # Collapse multiple spaces
-]
+# Vendors change rarely (seeds, manual curation), so a short TTL keeps
+# the lookup fresh without reloading the table per ingest batch (same
+# cadence as RULES_CACHE_TTL_SECONDS in services/rules_cache)
+VENDOR_CACHE_TTL_SECONDS = 30.0
+
+# Below this many vendors the automaton buys nothing over the per-vendor
+# C-level substring checks (same gating as AC_MIN_NEEDLES in rules_cache)
+AC_MIN_VENDORS = 8
+
+# Real descriptors repeat heavily (the same store string recurs across
+# statements), so resolved results are memoized per cache generation;
+# the cap bounds memory against adversarial descriptor churn
+RESOLVED_MEMO_MAX = 4096
+
+# Regex only where the pattern genuinely varies; the descriptor is
+# uppercased before these run, so no IGNORECASE. Fixed-string processor
+# prefixes (TST*, PP*) and whitespace collapse are handled with plain
+# str operations in _clean_slow — C-level, no SRE interpreter.
+# Square/Shopify prefixes with optional space before the star
+_STAR_PREFIX_RE = re.compile(r"(?:SQ|SP)\s*\*")
+# Store numbers like " #1234" and "STORE 123"
+_STORE_NUM_RE = re.compile(r"\s*#\d+|\s+STORE\s+\d+")
+# Trailing 3-5 digit numbers
+_TRAILING_NUM_RE = re.compile(r"\s+\d{3,5}\s*$")
+
+
+# Two-stage cache, same layout CPython uses for re._compile: a plain
+# dict probe in front (no lock, no _make_key) backed by a larger LRU
+# that prevents thrash when the hot set exceeds the front dict
+_CLEAN_FAST: Dict[str, str] = {}
+_CLEAN_FAST_MAX = 256
+
+
+@lru_cache(maxsize=8192)
+def _clean_slow(descriptor: str) -> str:
+    """Run the cleanup passes (LRU tier behind _CLEAN_FAST)."""
+    cleaned = descriptor.upper()
+
+    # Literal processor prefixes need no regex
+    cleaned = cleaned.replace("TST*", "").replace("PP*", "")
+    if "*" in cleaned:
+        cleaned = _STAR_PREFIX_RE.sub("", cleaned)
+    # The digit scan is one C-level pass; most cleaned-up descriptors
+    # have no digits left and skip both substitutions
+    if any(ch.isdigit() for ch in cleaned):
+        cleaned = _STORE_NUM_RE.sub("", cleaned)
+        cleaned = _TRAILING_NUM_RE.sub("", cleaned)
+
+    # Collapses runs of whitespace and strips the ends in one pass
+    return " ".join(cleaned.split())
 
 
-@lru_cache(maxsize=1024)
 def _clean_descriptor(descriptor: str) -> str:
     """
     Clean a raw descriptor for better matching (cached).
@@ -43,180 +84,273 @@ def _clean_descriptor(descriptor: str) -> str:
     Returns:
         Cleaned descriptor string
     """
-    cleaned = descriptor.upper().strip()
+    cleaned = _CLEAN_FAST.get(descriptor)
+    if cleaned is not None:
+        return cleaned
+    cleaned = _clean_slow(descriptor)
+    if len(_CLEAN_FAST) >= _CLEAN_FAST_MAX:
+        _CLEAN_FAST.pop(next(iter(_CLEAN_FAST)))
+    _CLEAN_FAST[descriptor] = cleaned
+    return cleaned
+
+
+def _build_vendor_lookup(
+    vendors: Sequence[Vendor],
+) -> Dict[str, object]:
+    """
+    Build in-memory lookup structures from the vendors table.
+
+    Returns a dict with:
+        exact: canonical name → canonical name
+        upper: upper(canonical name) → canonical name
+        alias_exact: alias → canonical name
+        alias_upper: upper(alias) → canonical name
+        alias_cleaned: cleaned(alias) → canonical name
+        fuzzy: list of (upper(canonical name), canonical name)
+        fuzzy_needles: containment needle → canonical name, covering
+            upper canonical names plus upper and cleaned aliases
+        automaton: AhoCorasick over the fuzzy_needles keys, or None
+            below the AC_MIN_VENDORS threshold
+    """
+    exact: Dict[str, str] = {}
+    upper: Dict[str, str] = {}
+    alias_exact: Dict[str, str] = {}
+    alias_upper: Dict[str, str] = {}
+    alias_cleaned: Dict[str, str] = {}
+    fuzzy: List[Tuple[str, str]] = []
+    fuzzy_needles: Dict[str, str] = {}
+
+    for vendor in vendors:
+        name = vendor.canonical_vendor
+        exact.setdefault(name, name)
+        upper.setdefault(name.upper(), name)
+        fuzzy.append((name.upper(), name))
+        fuzzy_needles.setdefault(name.upper(), name)
+        for alias in vendor.aliases or ():
+            alias_exact.setdefault(alias, name)
+            alias_upper.setdefault(alias.upper(), name)
+            cleaned_alias = _clean_descriptor(alias)
+            alias_cleaned.setdefault(cleaned_alias, name)
+            fuzzy_needles.setdefault(alias.upper(), name)
+            if cleaned_alias:
+                fuzzy_needles.setdefault(cleaned_alias, name)
+
+    return {
+        "exact": exact,
+        "upper": upper,
+        "alias_exact": alias_exact,
+        "alias_upper": alias_upper,
+        "alias_cleaned": alias_cleaned,
+        "fuzzy": fuzzy,
+        "fuzzy_needles": fuzzy_needles,
+        "automaton": (
+            AhoCorasick(fuzzy_needles)
+            if len(fuzzy) >= AC_MIN_VENDORS else None
+        ),
+        # Descriptor → result memo; lives and dies with this lookup, so
+        # vendor edits invalidate it on the next cache reload
+        "resolved": {},
+    }
+
+
+@dataclass
+class _CachedVendors:
+    lookup: Dict[str, object]
+    loaded_at: float
+
+
+_cache: Optional[_CachedVendors] = None
+
+
+def clear_vendor_cache() -> None:
+    """Drop the vendor lookup cache (used by tests and vendor updates)."""
+    global _cache
+    _cache = None
+
+
+async def _get_vendor_lookup(db: AsyncSession) -> Dict[str, object]:
+    """
+    Return the prebuilt vendor lookup structures.
 
-    for pattern, replacement in CLEANUP_PATTERNS:
-        cleaned = re.sub(pattern, replacement, cleaned, flags=re.IGNORECASE)
+    Loads the vendors table at most once per VENDOR_CACHE_TTL_SECONDS;
+    between reloads every normalization call is pure in-memory string
+    matching, so a 10k-row ingest costs one vendors query instead of one
+    per batch.
+    """
+    global _cache
 
-    return cleaned.strip()
+    now = time.monotonic()
+    if _cache is not None and now - _cache.loaded_at < VENDOR_CACHE_TTL_SECONDS:
+        return _cache.lookup
 
+    result = await db.execute(select(Vendor))
+    vendors = result.scalars().all()
+    lookup = _build_vendor_lookup(vendors)
+    _cache = _CachedVendors(lookup=lookup, loaded_at=now)
+    logger.debug(
+        "Loaded %s vendors into the lookup cache (%s aliases)",
+        len(lookup["exact"]), len(lookup["alias_exact"]),
+    )
+    return lookup
 
-async def normalize_vendor(
-    raw_descriptor: str, db: AsyncSession
+
+def _resolve_descriptor(
+    raw_descriptor: str, lookup: Dict[str, object]
 ) -> Optional[str]:
     """
-    Normalize a raw transaction descriptor to a canonical vendor name.
+    Resolve one descriptor against prebuilt lookup structures.
 
-    Matching strategy:
-    1. Exact match on descriptor
+    Matching strategy (same order as the previous per-query version):
+    1. Exact match on canonical vendor name
     2. Case-insensitive match
     3. Cleaned descriptor match
     4. Alias match (exact and case-insensitive)
     5. Cleaned alias match
-    6. Fuzzy pattern match on cleaned descriptor
-
-    Args:
-        raw_descriptor: Raw merchant descriptor from transaction
-        db: Database session
-
-    Returns:
-        Canonical vendor name if match found, None otherwise
-
-    Example:
-        >>> await normalize_vendor("TST* STARBUCKS 1234", db)
-        "Starbucks"
-        >>> await normalize_vendor("NETFLIX.COM", db)
-        "Netflix"
+    6. Fuzzy containment match on cleaned descriptor
     """
-    if not raw_descriptor:
-        logger.debug("Empty descriptor provided")
-        return None
-
     descriptor_upper = raw_descriptor.upper()
     cleaned = _clean_descriptor(raw_descriptor)
 
-    logger.debug(
-        f"Normalizing vendor: '{raw_descriptor}' → cleaned: '{cleaned}'",
-        extra={
-            "raw": raw_descriptor,
-            "cleaned": cleaned,
-        },
+    match = (
+        lookup["exact"].get(raw_descriptor)
+        or lookup["upper"].get(descriptor_upper)
+        or lookup["upper"].get(cleaned)
+        or lookup["alias_exact"].get(raw_descriptor)
+        or lookup["alias_upper"].get(descriptor_upper)
+        or lookup["alias_cleaned"].get(cleaned)
     )
-
-    try:
-        # Strategy 1: Exact match on canonical vendor name
-        result = await db.execute(
-            select(Vendor).where(Vendor.canonical_vendor == raw_descriptor)
+    if match:
+        logger.info(
+            "Vendor match: '%s' → %s", raw_descriptor, match,
+            extra={"vendor": match},
         )
-        vendor = result.scalar_one_or_none()
-        if vendor:
+        return match
+
+    automaton = lookup["automaton"]
+    if automaton is not None:
+        # One pass over the descriptor finds every vendor name or alias
+        # occurring in it, instead of one substring scan per needle;
+        # the longest hit wins as the most specific
+        found = automaton.find_all(cleaned)
+        if found:
+            name = lookup["fuzzy_needles"][max(found, key=len)]
             logger.info(
-                f"Exact match: '{raw_descriptor}' → {vendor.canonical_vendor}",
-                extra={"match_type": "exact", "vendor": vendor.canonical_vendor},
+                "Fuzzy vendor match: '%s' → %s", raw_descriptor, name,
+                extra={"match_type": "fuzzy", "vendor": name},
             )
-            return vendor.canonical_vendor
-
-        # Strategy 2: Case-insensitive match on canonical vendor
-        result = await db.execute(
-            select(Vendor).where(
-                func.upper(Vendor.canonical_vendor) == descriptor_upper
-            )
-        )
-        vendor = result.scalar_one_or_none()
-        if vendor:
-            logger.info(
-                f"Case-insensitive match: '{raw_descriptor}' → {vendor.canonical_vendor}",
-                extra={
-                    "match_type": "case_insensitive",
-                    "vendor": vendor.canonical_vendor,
-                },
-            )
-            return vendor.canonical_vendor
-
-        # Strategy 3: Cleaned descriptor match
-        if cleaned != descriptor_upper:
-            result = await db.execute(
-                select(Vendor).where(
-                    func.upper(Vendor.canonical_vendor) == cleaned
-                )
-            )
-            vendor = result.scalar_one_or_none()
-            if vendor:
+            return name
+        # Inverse containment (descriptor inside a vendor name) stays a
+        # bounded per-vendor check; the automaton only covers forward hits
+        for vendor_upper, name in lookup["fuzzy"]:
+            if cleaned in vendor_upper:
                 logger.info(
-                    f"Cleaned match: '{raw_descriptor}' → {vendor.canonical_vendor}",
-                    extra={
-                        "match_type": "cleaned",
-                        "vendor": vendor.canonical_vendor,
-                    },
+                    "Fuzzy vendor match: '%s' → %s", raw_descriptor, name,
+                    extra={"match_type": "fuzzy", "vendor": name},
                 )
-                return vendor.canonical_vendor
-
-        # Strategy 4 & 5: Alias matching (exact, case-insensitive, cleaned)
-        # Search through all vendors and check if descriptor matches any alias
-        result = await db.execute(select(Vendor))
-        vendors = result.scalars().all()
-
-        for vendor in vendors:
-            if not vendor.aliases:
-                continue
-
-            for alias in vendor.aliases:
-                # Exact alias match
-                if alias == raw_descriptor:
-                    logger.info(
-                        f"Alias exact match: '{raw_descriptor}' → {vendor.canonical_vendor}",
-                        extra={
-                            "match_type": "alias_exact",
-                            "vendor": vendor.canonical_vendor,
-                            "alias": alias,
-                        },
-                    )
-                    return vendor.canonical_vendor
-
-                # Case-insensitive alias match
-                if alias.upper() == descriptor_upper:
-                    logger.info(
-                        f"Alias case-insensitive match: '{raw_descriptor}' → {vendor.canonical_vendor}",
-                        extra={
-                            "match_type": "alias_case_insensitive",
-                            "vendor": vendor.canonical_vendor,
-                            "alias": alias,
-                        },
-                    )
-                    return vendor.canonical_vendor
-
-                # Cleaned alias match
-                cleaned_alias = _clean_descriptor(alias)
-                if cleaned_alias == cleaned:
-                    logger.info(
-                        f"Alias cleaned match: '{raw_descriptor}' → {vendor.canonical_vendor}",
-                        extra={
-                            "match_type": "alias_cleaned",
-                            "vendor": vendor.canonical_vendor,
-                            "alias": alias,
-                        },
-                    )
-                    return vendor.canonical_vendor
-
-        # Strategy 6: Fuzzy pattern matching on cleaned descriptor
-        # Check if cleaned descriptor contains canonical vendor name
-        for vendor in vendors:
-            vendor_upper = vendor.canonical_vendor.upper()
-            if vendor_upper in cleaned or cleaned in vendor_upper:
+                return name
+    else:
+        # Same longest-match-wins semantics as the automaton path: collect
+        # every containment hit and take the most specific needle
+        hits = [n for n in lookup["fuzzy_needles"] if n in cleaned]
+        if hits:
+            name = lookup["fuzzy_needles"][max(hits, key=len)]
+            logger.info(
+                "Fuzzy vendor match: '%s' → %s", raw_descriptor, name,
+                extra={"match_type": "fuzzy", "vendor": name},
+            )
+            return name
+        for vendor_upper, name in lookup["fuzzy"]:
+            if cleaned in vendor_upper:
                 logger.info(
-                    f"Fuzzy match: '{raw_descriptor}' → {vendor.canonical_vendor}",
-                    extra={
-                        "match_type": "fuzzy",
-                        "vendor": vendor.canonical_vendor,
-                    },
+                    "Fuzzy vendor match: '%s' → %s", raw_descriptor, name,
+                    extra={"match_type": "fuzzy", "vendor": name},
                 )
-                return vendor.canonical_vendor
+                return name
+
+    logger.debug(
+        "No vendor match found for '%s'", raw_descriptor,
+        extra={"raw": raw_descriptor, "cleaned": cleaned},
+    )
+    return None
 
-        logger.debug(
-            f"No vendor match found for '{raw_descriptor}'",
-            extra={"raw": raw_descriptor, "cleaned": cleaned},
-        )
-        return None
+
+async def normalize_vendors(
+    descriptors: Sequence[str], db: AsyncSession
+) -> Dict[str, Optional[str]]:
+    """
+    Normalize a batch of raw descriptors against the cached vendor lookup.
+
+    The vendors table is loaded once per cache TTL (see
+    _get_vendor_lookup) and every descriptor resolves in one Python
+    pass — N round trips collapse into at most one for the bulk ingest
+    path.
+
+    Args:
+        descriptors: Raw merchant descriptors (duplicates are fine)
+        db: Database session
+
+    Returns:
+        Dict mapping each distinct descriptor to its canonical vendor
+        name, or None where no match was found
+    """
+    resolved: Dict[str, Optional[str]] = {}
+    unique = [d for d in dict.fromkeys(descriptors) if d]
+    if not unique:
+        return {d: None for d in descriptors}
+
+    try:
+        lookup = await _get_vendor_lookup(db)
+        memo = lookup["resolved"]
+
+        for descriptor in unique:
+            try:
+                match = memo[descriptor]
+            except KeyError:
+                match = _resolve_descriptor(descriptor, lookup)
+                if len(memo) >= RESOLVED_MEMO_MAX:
+                    memo.pop(next(iter(memo)))
+                memo[descriptor] = match
+            resolved[descriptor] = match
+        return resolved
 
     except Exception as e:
         logger.error(
-            f"Error normalizing vendor '{raw_descriptor}': {e}",
-            extra={"raw": raw_descriptor, "error": str(e)},
+            f"Error normalizing vendor batch: {e}",
+            extra={"count": len(unique), "error": str(e)},
             exc_info=True,
         )
-        # Return None on error rather than raising
+        # Return None for everything on error rather than raising
+        return {d: None for d in unique}
+
+
+async def normalize_vendor(
+    raw_descriptor: str, db: AsyncSession
+) -> Optional[str]:
+    """
+    Normalize a raw transaction descriptor to a canonical vendor name.
+
+    Thin wrapper over normalize_vendors for single-row callers.
+
+    Args:
+        raw_descriptor: Raw merchant descriptor from transaction
+        db: Database session
+
+    Returns:
+        Canonical vendor name if match found, None otherwise
+
+    Example:
+        >>> await normalize_vendor("TST* STARBUCKS 1234", db)
+        "Starbucks"
+        >>> await normalize_vendor("NETFLIX.COM", db)
+        "Netflix"
+    """
+    if not raw_descriptor:
+        logger.debug("Empty descriptor provided")
         return None
 
+    resolved = await normalize_vendors([raw_descriptor], db)
+    return resolved.get(raw_descriptor)
+
 
 async def get_vendor_category(
     canonical_vendor: str, db: AsyncSession
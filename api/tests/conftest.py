@@ -16,9 +16,28 @@ from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.categorize import clear_openai_cache
 from app.db import Base, get_db
+from app.deps import get_session_factory
 from app.main import app
 from app.models import Transaction, Vendor, Rule
+from app.routers.reports import clear_summary_cache
+from app.services.rules_cache import clear_rules_cache
+from app.services.vendor_normalize import clear_vendor_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_service_caches():
+    """Keep cached OpenAI results, compiled rules, vendors, and summaries from leaking between tests."""
+    clear_openai_cache()
+    clear_rules_cache()
+    clear_summary_cache()
+    clear_vendor_cache()
+    yield
+    clear_openai_cache()
+    clear_rules_cache()
+    clear_summary_cache()
+    clear_vendor_cache()
 
 
 # ============================================================================
@@ -95,7 +114,16 @@ async def test_client(test_db: AsyncSession) -> AsyncGenerator[AsyncClient, None
     async def override_get_db():
         yield test_db
 
+    # Background tasks open their own sessions; bind their factory to the
+    # same in-memory engine as the request session
+    test_session_factory = async_sessionmaker(
+        test_db.bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: test_session_factory
 
     # Create test client
     async with AsyncClient(
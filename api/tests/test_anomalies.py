@@ -10,7 +10,6 @@ This module tests anomaly detection functionality including:
 - Empty result handling
 """
 from datetime import date, timedelta
-from decimal import Decimal
 
 import pytest
 from httpx import AsyncClient
@@ -350,7 +349,7 @@ class TestPendingReviewAlerts:
             source_account="amex",
             hash_id=hash_generator(today, 1000, "UNKNOWN", "amex"),
             category="Shopping",
-            confidence=Decimal("0.60"),  # Low confidence
+            confidence_bp=6000,  # Low confidence
             status="review",
         )
         test_db.add(txn)
@@ -382,7 +381,7 @@ class TestPendingReviewAlerts:
             source_account="amex",
             hash_id=hash_generator(today, 10000, "BIG PURCHASE", "amex"),
             category="Shopping",
-            confidence=Decimal("0.95"),  # High confidence
+            confidence_bp=9500,  # High confidence
             status="review",  # But still in review due to amount
         )
         test_db.add(txn)
@@ -475,7 +474,7 @@ class TestAnomaliesEndpoint:
                 source_account="amex",
                 hash_id=hash_generator(today, 1000, "UNKNOWN", "amex"),
                 category="Shopping",
-                confidence=Decimal("0.50"),
+                confidence_bp=5000,
                 status="review",
             ),
         ]
@@ -11,7 +11,6 @@ This module tests the categorization system including:
 - Manual category finalization
 """
 from datetime import date
-from decimal import Decimal
 from unittest.mock import AsyncMock, patch, MagicMock
 import json
 
@@ -21,7 +20,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Transaction, Rule
-from app.categorize import categorize_transaction, categorize_with_openai, TAXONOMY
+from app.categorize import (
+    categorize_transaction,
+    categorize_with_openai,
+    match_rule_only,
+    TAXONOMY,
+)
 from app.config import settings
 
 
@@ -41,7 +45,7 @@ class TestCategorizeWithRule:
         assert result is not None
         assert result["category"] == "Dining"
         assert result["subcategory"] == "Coffee"
-        assert result["confidence"] == Decimal("1.00")
+        assert result["confidence_bp"] == 10_000
 
     @pytest.mark.asyncio
     async def test_categorize_multiple_rules_priority(
@@ -71,7 +75,32 @@ class TestCategorizeWithRule:
 
         assert result["category"] == "First"
         assert result["subcategory"] == "Priority 1"
-        assert result["confidence"] == Decimal("1.00")
+        assert result["confidence_bp"] == 10_000
+
+    @pytest.mark.asyncio
+    async def test_rule_match_short_circuits_ai(
+        self,
+        test_db: AsyncSession,
+        sample_transaction: Transaction,
+        sample_rule: Rule
+    ):
+        """Test the AI path is never entered when a rule matches."""
+        with patch("app.categorize.openai_client.chat.completions.create") as mock_create:
+            result = await categorize_transaction(sample_transaction, test_db)
+
+        assert result["category"] == "Dining"
+        mock_create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_match_rule_only_miss_returns_none(
+        self,
+        test_db: AsyncSession,
+        sample_transaction: Transaction
+    ):
+        """Test match_rule_only returns None (no AI fallback) on a miss."""
+        result = await match_rule_only(sample_transaction, test_db)
+
+        assert result is None
 
 
 class TestCategorizeWithOpenAI:
@@ -107,7 +136,7 @@ class TestCategorizeWithOpenAI:
             assert result is not None
             assert result["category"] == "Dining"
             assert result["subcategory"] == "Coffee"
-            assert result["confidence"] == Decimal("0.93")
+            assert result["confidence_bp"] == 9300
             assert result["vendor"] == "Starbucks"
 
             # Verify OpenAI was called
@@ -174,7 +203,7 @@ class TestCategorizeWithOpenAI:
             assert result is not None
             assert result["category"] == "Shopping"
             assert result["subcategory"] == "Uncategorized"
-            assert result["confidence"] == Decimal("0.30")
+            assert result["confidence_bp"] == 3000
             assert mock_create.call_count == 3  # max_retries + 1
 
     @pytest.mark.asyncio
@@ -223,7 +252,7 @@ class TestCategorizeWithOpenAI:
 
             # Should fall back to "Shopping" and lower confidence
             assert result["category"] == "Shopping"
-            assert result["confidence"] == Decimal("0.50")
+            assert result["confidence_bp"] == 5000
 
     @pytest.mark.asyncio
     async def test_openai_rate_limit_retry(
@@ -396,7 +425,7 @@ class TestFinalizeEndpoint:
         sample_transaction.status = "review"
         sample_transaction.category = "Shopping"
         sample_transaction.subcategory = "Unknown"
-        sample_transaction.confidence = Decimal("0.60")
+        sample_transaction.confidence_bp = 6000
         await test_db.commit()
 
         # Finalize with correct category
@@ -486,7 +515,7 @@ class TestConfidenceScoring:
             result = await categorize_with_openai(sample_transaction)
 
             # Confidence should be clamped to 1.0
-            assert result["confidence"] == Decimal("1.00")
+            assert result["confidence_bp"] == 10_000
 
     @pytest.mark.asyncio
     async def test_confidence_threshold_boundary(
@@ -519,3 +548,117 @@ class TestConfidenceScoring:
             data = response.json()
             # At threshold should finalize (>=)
             assert data["status"] == "finalized"
+
+
+class TestBulkCategorizeEndpoint:
+    """Test /categorize/bulk endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_categorize_rule_hits(
+        self,
+        test_client: AsyncClient,
+        test_db: AsyncSession,
+        sample_rule: Rule,
+        hash_generator
+    ):
+        """Test a batch fully covered by rules makes no OpenAI calls."""
+        txns = []
+        for i in range(3):
+            txn = Transaction(
+                txn_date=date(2025, 10, 20 + i),
+                amount_cents=700 + i,
+                currency="USD",
+                direction="debit",
+                raw_descriptor=f"STARBUCKS {i}",
+                source_account="amex",
+                hash_id=hash_generator(
+                    date(2025, 10, 20 + i), 700 + i, f"STARBUCKS {i}", "amex"
+                ),
+            )
+            test_db.add(txn)
+            txns.append(txn)
+        await test_db.commit()
+        for txn in txns:
+            await test_db.refresh(txn)
+
+        with patch("app.categorize.openai_client.chat.completions.create", new_callable=AsyncMock) as mock_create:
+            response = await test_client.post(
+                "/categorize/bulk", json=[txn.id for txn in txns]
+            )
+
+            assert response.status_code == 200
+            data = response.json()
+            assert len(data) == 3
+            assert all(item["category"] == "Dining" for item in data)
+            assert all(item["status"] == "finalized" for item in data)
+            mock_create.assert_not_called()
+
+        # Verify database updated
+        for txn in txns:
+            await test_db.refresh(txn)
+            assert txn.category == "Dining"
+            assert txn.confidence_bp == 10_000
+            assert txn.status == "finalized"
+
+    @pytest.mark.asyncio
+    async def test_bulk_categorize_mixed_rules_and_ai(
+        self,
+        test_client: AsyncClient,
+        test_db: AsyncSession,
+        sample_rule: Rule,
+        sample_transaction: Transaction,
+        hash_generator
+    ):
+        """Test rows missing every rule fall through to concurrent AI calls."""
+        unmatched = Transaction(
+            txn_date=date(2025, 10, 25),
+            amount_cents=1500,
+            currency="USD",
+            direction="debit",
+            raw_descriptor="MYSTERY SHOP",
+            source_account="amex",
+            hash_id=hash_generator(
+                date(2025, 10, 25), 1500, "MYSTERY SHOP", "amex"
+            ),
+        )
+        test_db.add(unmatched)
+        await test_db.commit()
+        await test_db.refresh(unmatched)
+
+        mock_response = MagicMock()
+        mock_response.choices = [
+            MagicMock(
+                message=MagicMock(
+                    content=json.dumps({
+                        "category": "Shopping",
+                        "subcategory": "Retail",
+                        "confidence": 0.90,
+                        "vendor": "Mystery Shop"
+                    })
+                )
+            )
+        ]
+
+        with patch("app.categorize.openai_client.chat.completions.create", new_callable=AsyncMock) as mock_create:
+            mock_create.return_value = mock_response
+
+            response = await test_client.post(
+                "/categorize/bulk",
+                json=[sample_transaction.id, unmatched.id]
+            )
+
+            assert response.status_code == 200
+            data = {item["id"]: item for item in response.json()}
+            # Rule hit (STARBUCKS descriptor)
+            assert data[sample_transaction.id]["category"] == "Dining"
+            # AI fallback
+            assert data[unmatched.id]["category"] == "Shopping"
+            assert mock_create.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_bulk_categorize_empty_batch(self, test_client: AsyncClient):
+        """Test empty id list is a no-op."""
+        response = await test_client.post("/categorize/bulk", json=[])
+
+        assert response.status_code == 200
+        assert response.json() == []
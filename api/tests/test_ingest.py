@@ -425,3 +425,209 @@ class TestIngestEdgeCases:
         txn = result.scalar_one()
 
         assert txn.direction == "credit"
+
+
+class TestBulkInsert:
+    """Test the COPY-backed bulk insert helper."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_transactions(
+        self,
+        test_db: AsyncSession,
+        hash_generator
+    ):
+        """Test bulk inserting a batch of transactions."""
+        from app.db_bulk import bulk_insert_transactions
+
+        rows = [
+            {
+                "txn_date": date(2025, 10, day),
+                "amount_cents": 1000 + day,
+                "direction": "debit",
+                "raw_descriptor": f"VENDOR {day}",
+                "source_account": "amex",
+                "hash_id": hash_generator(
+                    date(2025, 10, day), 1000 + day, f"VENDOR {day}", "amex"
+                ),
+            }
+            for day in range(1, 11)
+        ]
+
+        inserted = await bulk_insert_transactions(test_db, rows)
+        await test_db.commit()
+
+        assert inserted == 10
+
+        result = await test_db.execute(select(Transaction))
+        txns = result.scalars().all()
+        assert len(txns) == 10
+        # Optional columns are defaulted
+        assert all(t.currency == "USD" for t in txns)
+        assert all(t.status == "ingested" for t in txns)
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_empty_batch(self, test_db: AsyncSession):
+        """Test bulk insert with no rows is a no-op."""
+        from app.db_bulk import bulk_insert_transactions
+
+        inserted = await bulk_insert_transactions(test_db, [])
+        assert inserted == 0
+
+
+class TestBulkIngestEndpoint:
+    """Test /ingest/bulk POST endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_ingest_new_transactions(
+        self,
+        test_client: AsyncClient,
+        test_db: AsyncSession,
+        hash_generator
+    ):
+        """Test ingesting a batch of new transactions in one request."""
+        payload = [
+            {
+                "txn_date": str(date(2025, 10, day)),
+                "amount_cents": 500 + day,
+                "currency": "USD",
+                "direction": "debit",
+                "raw_descriptor": f"BULK VENDOR {day}",
+                "source_account": "visa_rewards",
+                "hash_id": hash_generator(
+                    date(2025, 10, day), 500 + day, f"BULK VENDOR {day}", "visa_rewards"
+                ),
+            }
+            for day in range(1, 6)
+        ]
+
+        response = await test_client.post("/ingest/bulk", json=payload)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 5
+        assert len(data["ids"]) == 5
+        assert data["status"] == "ingested"
+
+        result = await test_db.execute(select(Transaction))
+        assert len(result.scalars().all()) == 5
+
+    @pytest.mark.asyncio
+    async def test_bulk_ingest_upserts_existing(
+        self,
+        test_client: AsyncClient,
+        test_db: AsyncSession,
+        hash_generator
+    ):
+        """Test that re-ingesting a batch updates rather than duplicates."""
+        payload = [
+            {
+                "txn_date": "2025-10-24",
+                "amount_cents": 999,
+                "currency": "USD",
+                "direction": "debit",
+                "raw_descriptor": "BULK DUPLICATE",
+                "source_account": "amex",
+                "hash_id": hash_generator(
+                    date(2025, 10, 24), 999, "BULK DUPLICATE", "amex"
+                ),
+            }
+        ]
+
+        first = await test_client.post("/ingest/bulk", json=payload)
+        payload[0]["memo"] = "Updated memo"
+        second = await test_client.post("/ingest/bulk", json=payload)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert first.json()["ids"] == second.json()["ids"]
+
+        result = await test_db.execute(select(Transaction))
+        txns = result.scalars().all()
+        assert len(txns) == 1
+        assert txns[0].memo == "Updated memo"
+
+    @pytest.mark.asyncio
+    async def test_bulk_ingest_empty_batch(self, test_client: AsyncClient):
+        """Test bulk ingest with an empty list is a no-op."""
+        response = await test_client.post("/ingest/bulk", json=[])
+
+        assert response.status_code == 200
+        assert response.json() == {"ids": [], "count": 0, "status": "ingested"}
+
+    @pytest.mark.asyncio
+    async def test_bulk_ingest_applies_rules(
+        self,
+        test_client: AsyncClient,
+        test_db: AsyncSession,
+        sample_rule,
+        hash_generator
+    ):
+        """Test rows matching a deterministic rule arrive pre-categorized."""
+        payload = [
+            {
+                "txn_date": "2025-10-24",
+                "amount_cents": 784,
+                "currency": "USD",
+                "direction": "debit",
+                "raw_descriptor": "STARBUCKS 9999",
+                "source_account": "amex",
+                "hash_id": hash_generator(
+                    date(2025, 10, 24), 784, "STARBUCKS 9999", "amex"
+                ),
+            },
+            {
+                "txn_date": "2025-10-24",
+                "amount_cents": 1200,
+                "currency": "USD",
+                "direction": "debit",
+                "raw_descriptor": "NO RULE FOR THIS",
+                "source_account": "amex",
+                "hash_id": hash_generator(
+                    date(2025, 10, 24), 1200, "NO RULE FOR THIS", "amex"
+                ),
+            },
+        ]
+
+        response = await test_client.post("/ingest/bulk", json=payload)
+
+        assert response.status_code == 200
+        result = await test_db.execute(
+            select(Transaction).order_by(Transaction.amount_cents)
+        )
+        matched, unmatched = result.scalars().all()
+        assert matched.category == "Dining"
+        assert matched.subcategory == "Coffee"
+        assert matched.confidence_bp == 10_000
+        assert unmatched.category is None
+        assert unmatched.confidence_bp is None
+
+    @pytest.mark.asyncio
+    async def test_bulk_ingest_dedupes_batch(
+        self,
+        test_client: AsyncClient,
+        test_db: AsyncSession,
+        hash_generator
+    ):
+        """Test duplicate hash_ids within one batch collapse to one row."""
+        hash_id = hash_generator(date(2025, 10, 24), 999, "RETRY VENDOR", "amex")
+        row = {
+            "txn_date": "2025-10-24",
+            "amount_cents": 999,
+            "currency": "USD",
+            "direction": "debit",
+            "raw_descriptor": "RETRY VENDOR",
+            "source_account": "amex",
+            "hash_id": hash_id,
+        }
+        payload = [row, {**row, "memo": "second submission"}]
+
+        response = await test_client.post("/ingest/bulk", json=payload)
+
+        assert response.status_code == 200
+        assert response.json()["count"] == 1
+
+        result = await test_db.execute(select(Transaction))
+        txns = result.scalars().all()
+        assert len(txns) == 1
+        # Last write in the batch wins
+        assert txns[0].memo == "second submission"
@@ -15,9 +15,11 @@ import hashlib
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.models import Transaction
+from app.models import Transaction, Report
+from app.routers.reports import _cache_report, clear_summary_cache
 
 
 class TestMonthlySummary:
@@ -375,6 +377,198 @@ class TestCategoryFilter:
         assert data["total_expense_cents"] == 1000
 
 
+class TestSummaryCache:
+    """Test the in-process TTL cache for month summaries."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_month_request_served_from_cache(
+        self,
+        test_client: AsyncClient,
+        test_db: AsyncSession,
+        hash_generator
+    ):
+        """Test a repeated month request answers from cache, not the DB."""
+        txn = Transaction(
+            txn_date=date(2025, 10, 1),
+            amount_cents=1000,
+            currency="USD",
+            direction="debit",
+            raw_descriptor="FIRST TXN",
+            source_account="amex",
+            hash_id=hash_generator(date(2025, 10, 1), 1000, "FIRST TXN", "amex"),
+            category="Shopping",
+            status="finalized",
+        )
+        test_db.add(txn)
+        await test_db.commit()
+
+        first = await test_client.get("/report/summary?month=2025-10")
+        assert first.status_code == 200
+        assert first.json()["total_expense_cents"] == 1000
+
+        # A new transaction lands after the first request; the cached
+        # summary is served until the TTL expires
+        later = Transaction(
+            txn_date=date(2025, 10, 2),
+            amount_cents=2000,
+            currency="USD",
+            direction="debit",
+            raw_descriptor="SECOND TXN",
+            source_account="amex",
+            hash_id=hash_generator(date(2025, 10, 2), 2000, "SECOND TXN", "amex"),
+            category="Shopping",
+            status="finalized",
+        )
+        test_db.add(later)
+        await test_db.commit()
+
+        second = await test_client.get("/report/summary?month=2025-10")
+        assert second.status_code == 200
+        assert second.json()["total_expense_cents"] == 1000
+
+    @pytest.mark.asyncio
+    async def test_filtered_requests_bypass_cache(
+        self,
+        test_client: AsyncClient,
+        test_db: AsyncSession,
+        hash_generator
+    ):
+        """Test requests with row filters always hit the database."""
+        txn = Transaction(
+            txn_date=date(2025, 10, 1),
+            amount_cents=1000,
+            currency="USD",
+            direction="debit",
+            raw_descriptor="GROCERIES",
+            source_account="amex",
+            hash_id=hash_generator(date(2025, 10, 1), 1000, "GROCERIES", "amex"),
+            category="Groceries",
+            status="finalized",
+        )
+        test_db.add(txn)
+        await test_db.commit()
+
+        url = "/report/summary?month=2025-10&category=Groceries"
+        first = await test_client.get(url)
+        assert first.json()["total_expense_cents"] == 1000
+
+        txn.amount_cents = 5000
+        await test_db.commit()
+
+        second = await test_client.get(url)
+        assert second.json()["total_expense_cents"] == 5000
+
+
+class TestReportTableCache:
+    """Test the durable Report-table cache tier behind the summary."""
+
+    @pytest.mark.asyncio
+    async def test_summary_persists_report_row(
+        self,
+        test_client: AsyncClient,
+        test_db: AsyncSession,
+        hash_generator
+    ):
+        """Test a month summary lands exactly one row in reports."""
+        txn = Transaction(
+            txn_date=date(2025, 10, 1),
+            amount_cents=1000,
+            currency="USD",
+            direction="debit",
+            raw_descriptor="CACHED TXN",
+            source_account="amex",
+            hash_id=hash_generator(date(2025, 10, 1), 1000, "CACHED TXN", "amex"),
+            category="Shopping",
+            status="finalized",
+        )
+        test_db.add(txn)
+        await test_db.commit()
+
+        response = await test_client.get("/report/summary?month=2025-10")
+        assert response.status_code == 200
+
+        # The background task ran after the response; the upsert must
+        # have actually landed a row
+        reports = (await test_db.execute(select(Report))).scalars().all()
+        assert len(reports) == 1
+        report = reports[0]
+        assert report.period == "2025-10"
+        assert report.kind == "monthly"
+        assert report.payload["total_expense_cents"] == 1000
+        assert report.payload_hash is not None
+
+    @pytest.mark.asyncio
+    async def test_background_write_refreshes_persisted_row(
+        self,
+        test_client: AsyncClient,
+        test_db: AsyncSession,
+        hash_generator
+    ):
+        """Test the post-response background write keeps the row current."""
+        txn = Transaction(
+            txn_date=date(2025, 10, 1),
+            amount_cents=1000,
+            currency="USD",
+            direction="debit",
+            raw_descriptor="FIRST TXN",
+            source_account="amex",
+            hash_id=hash_generator(date(2025, 10, 1), 1000, "FIRST TXN", "amex"),
+            category="Shopping",
+            status="finalized",
+        )
+        test_db.add(txn)
+        await test_db.commit()
+
+        first = await test_client.get("/report/summary?month=2025-10")
+        assert first.status_code == 200
+
+        # New data lands; dropping the in-process cache forces the next
+        # request to re-aggregate and schedule a fresh background write
+        later = Transaction(
+            txn_date=date(2025, 10, 2),
+            amount_cents=2000,
+            currency="USD",
+            direction="debit",
+            raw_descriptor="SECOND TXN",
+            source_account="amex",
+            hash_id=hash_generator(date(2025, 10, 2), 2000, "SECOND TXN", "amex"),
+            category="Shopping",
+            status="finalized",
+        )
+        test_db.add(later)
+        await test_db.commit()
+        clear_summary_cache()
+
+        second = await test_client.get("/report/summary?month=2025-10")
+        assert second.status_code == 200
+
+        test_db.expire_all()
+        reports = (await test_db.execute(select(Report))).scalars().all()
+        assert len(reports) == 1
+        assert reports[0].payload["total_expense_cents"] == 3000
+
+    @pytest.mark.asyncio
+    async def test_cache_report_upserts_single_row(
+        self,
+        test_db: AsyncSession,
+    ):
+        """Test repeated cache writes update one row instead of erroring."""
+        session_factory = async_sessionmaker(
+            test_db.bind, class_=AsyncSession, expire_on_commit=False
+        )
+        payload = {"period": "2025-09", "total_expense_cents": 100}
+        await _cache_report(session_factory, "2025-09", payload)
+        await _cache_report(
+            session_factory,
+            "2025-09",
+            {"period": "2025-09", "total_expense_cents": 200},
+        )
+
+        reports = (await test_db.execute(select(Report))).scalars().all()
+        assert len(reports) == 1
+        assert reports[0].payload["total_expense_cents"] == 200
+
+
 class TestEdgeCases:
     """Test edge cases and boundary conditions."""
 
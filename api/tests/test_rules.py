@@ -18,6 +18,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Transaction, Rule
 from app.rules import apply_rules, evaluate_condition
+from app.services.contains_matcher import AhoCorasick
+from app.services.rules_cache import get_rule_matcher
+from app.services.rules_kernel import apply_rules_batch
 
 
 class TestRuleMatching:
@@ -571,3 +574,203 @@ class TestEdgeCases:
         result = evaluate_condition(txn, condition)
 
         assert result is True
+
+
+class TestBatchKernel:
+    """Test the columnar batch rule kernel."""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_in_priority_order(
+        self,
+        test_db: AsyncSession,
+        sample_rules
+    ):
+        """Test batch kernel applies the same rules as the row engine."""
+        results = await apply_rules_batch(
+            descriptors=["NETFLIX.COM", "HY-VEE 1234", "RANDOM SHOP"],
+            amounts=[1599, 8432, 500],
+            mccs=[None, None, None],
+            accounts=["amex", "amex", "amex"],
+            directions=["debit", "debit", "debit"],
+            db=test_db,
+        )
+
+        assert results[0]["category"] == "Subscriptions"
+        assert results[1]["category"] == "Groceries"
+        assert results[2] is None
+
+    @pytest.mark.asyncio
+    async def test_batch_mcc_and_amount_rules(
+        self,
+        test_db: AsyncSession,
+        sample_rules
+    ):
+        """Test MCC and amount-range conditions over a batch."""
+        results = await apply_rules_batch(
+            descriptors=["COFFEE PLACE", "BIG TICKET ITEM"],
+            amounts=[784, 250000],
+            mccs=["5814", None],
+            accounts=["amex", "amex"],
+            directions=["debit", "debit"],
+            db=test_db,
+        )
+
+        assert results[0]["category"] == "Dining"
+        assert results[1]["category"] == "Shopping"
+        assert results[1]["subcategory"] == "Large Purchase"
+
+    @pytest.mark.asyncio
+    async def test_batch_empty(self, test_db: AsyncSession):
+        """Test empty batch returns empty results."""
+        results = await apply_rules_batch(
+            descriptors=[],
+            amounts=[],
+            mccs=[],
+            accounts=[],
+            directions=[],
+            db=test_db,
+        )
+
+        assert results == []
+
+    @pytest.mark.asyncio
+    async def test_batch_vectorized_amount_masks(self, test_db: AsyncSession):
+        """Test amount-range rules over a batch large enough to vectorize."""
+        test_db.add(Rule(
+            priority=1,
+            condition={"amount_range": [100000, 999999999]},
+            action={"category": "Shopping", "subcategory": "Large Purchase"},
+            active=True,
+        ))
+        await test_db.commit()
+
+        n = 80  # Past VECTOR_MIN_ROWS, so the NumPy mask path runs
+        results = await apply_rules_batch(
+            descriptors=[f"SHOP {i}" for i in range(n)],
+            amounts=[250000 if i % 2 == 0 else 500 for i in range(n)],
+            mccs=[None] * n,
+            accounts=["amex"] * n,
+            directions=["debit"] * n,
+            db=test_db,
+        )
+
+        assert results[0]["subcategory"] == "Large Purchase"
+        assert results[1] is None
+        assert results[78]["category"] == "Shopping"
+
+
+class TestContainsMatcher:
+    """Test the Aho-Corasick matcher for contains rules."""
+
+    def test_find_all_overlapping_needles(self):
+        """Test nested and overlapping needles are all reported."""
+        automaton = AhoCorasick(["star", "starbucks", "bucks", "tar"])
+
+        found = automaton.find_all("starbucks 1234")
+
+        assert found == {"star", "starbucks", "bucks", "tar"}
+
+    def test_find_all_no_match(self):
+        """Test a descriptor containing no needles returns empty set."""
+        automaton = AhoCorasick(["netflix", "hulu"])
+
+        assert automaton.find_all("HY-VEE 1234".lower()) == set()
+
+    @pytest.mark.asyncio
+    async def test_automaton_path_respects_priority(
+        self,
+        test_db: AsyncSession
+    ):
+        """Test the automaton path still picks the highest-priority rule."""
+        # Enough contains rules to cross the automaton threshold, two of
+        # which match the same descriptor
+        needles = [
+            ("NETFLIX", 10), ("HULU", 11), ("SPOTIFY", 12), ("ICLOUD", 13),
+            ("STARBUCKS", 2), ("BUCKS", 1), ("HY-VEE", 14), ("TARGET", 15),
+        ]
+        for needle, priority in needles:
+            test_db.add(Rule(
+                priority=priority,
+                condition={"contains": needle},
+                action={"category": f"Cat-{needle}", "subcategory": None},
+                active=True,
+            ))
+        await test_db.commit()
+
+        matcher = await get_rule_matcher(test_db)
+        assert matcher.automaton is not None
+
+        txn = Transaction(
+            txn_date=date(2025, 10, 24),
+            amount_cents=784,
+            currency="USD",
+            direction="debit",
+            raw_descriptor="STARBUCKS 1234",
+            source_account="amex",
+            hash_id="test_hash",
+        )
+        rule = matcher.first_match(txn)
+
+        # BUCKS (priority 1) outranks STARBUCKS (priority 2)
+        assert rule is not None
+        assert rule.action["category"] == "Cat-BUCKS"
+
+    @pytest.mark.asyncio
+    async def test_bucketed_mcc_dispatch(
+        self,
+        test_db: AsyncSession
+    ):
+        """Test single-key mcc rules resolve from the prefilter bucket."""
+        test_db.add(Rule(
+            priority=1,
+            condition={"mcc": "5814"},
+            action={"category": "Dining", "subcategory": "Coffee"},
+            active=True,
+        ))
+        test_db.add(Rule(
+            priority=2,
+            condition={"contains": "STARBUCKS"},
+            action={"category": "Wrong", "subcategory": None},
+            active=True,
+        ))
+        await test_db.commit()
+
+        matcher = await get_rule_matcher(test_db)
+        assert "5814" in matcher.mcc_rules
+
+        txn = Transaction(
+            txn_date=date(2025, 10, 24),
+            amount_cents=784,
+            currency="USD",
+            direction="debit",
+            raw_descriptor="STARBUCKS 1234",
+            mcc="5814",
+            source_account="amex",
+            hash_id="test_hash",
+        )
+        rule = matcher.first_match(txn)
+
+        assert rule is not None
+        assert rule.action["category"] == "Dining"
+
+
+class TestCachedLowerDescriptor:
+    """Test the per-instance cached lowercase descriptor."""
+
+    def test_lowered_once_and_cached(self):
+        """Test raw_descriptor_lower lowers once and reuses the result."""
+        txn = Transaction(
+            txn_date=date(2025, 10, 24),
+            amount_cents=784,
+            currency="USD",
+            direction="debit",
+            raw_descriptor="STARBUCKS 1234",
+            source_account="amex",
+            hash_id="test_hash",
+        )
+
+        first = txn.raw_descriptor_lower
+
+        assert first == "starbucks 1234"
+        # cached_property memoizes in the instance dict
+        assert txn.raw_descriptor_lower is first